@@ -4,6 +4,7 @@ import androidx.room.Delete
 import androidx.room.Insert
 import androidx.room.OnConflictStrategy
 import androidx.room.Update
+import androidx.room.Upsert
 
 /**
  * 通用DAO接口
@@ -33,6 +34,27 @@ interface BaseDao<T> {
     @Insert(onConflict = OnConflictStrategy.REPLACE)
     suspend fun insertAll(entities: List<T>): List<Long>
     
+    /**
+     * 插入或更新单个实体
+     * 
+     * 与REPLACE策略不同，主键冲突时执行UPDATE而不是先DELETE再INSERT，
+     * 不会触发级联删除，也不会改变行ID
+     * 
+     * @param entity 要插入或更新的实体
+     */
+    @Upsert
+    suspend fun upsert(entity: T)
+    
+    /**
+     * 批量插入或更新实体
+     * 
+     * Room会在同一个事务中写入整个列表
+     * 
+     * @param entities 要插入或更新的实体列表
+     */
+    @Upsert
+    suspend fun upsertAll(entities: List<T>)
+    
     /**
      * 更新实体
      * 
@@ -66,6 +66,8 @@ object NetworkConfig {
         const val MAX_LENGTH = 4000 // 最大日志长度
         const val ENABLE_BODY_LOG = true // 是否启用请求体日志
         const val ENABLE_SENSITIVE_FILTER = true // 是否启用敏感信息过滤
+        const val TIMING_TAG = "NetworkTiming" // 结构化耗时记录的日志标签
+        const val MAX_BODY_LOG_BYTES = 1024L * 1024 // 超过该大小的响应体不缓冲记录（1MB）
     }
     
     /**
@@ -75,6 +77,9 @@ object NetworkConfig {
         const val BUFFER_SIZE = 8192L // 缓冲区大小
         const val PROGRESS_UPDATE_INTERVAL = 100L // 进度更新间隔（毫秒）
         const val MAX_FILE_SIZE = 100L * 1024 * 1024 // 最大文件大小（100MB）
+        const val DOWNLOAD_PARALLELISM = 4 // 默认并行下载分段数
+        const val MIN_SEGMENT_SIZE = 1L * 1024 * 1024 // 分段最小大小（1MB），小文件不拆分
+        const val STATE_SAVE_INTERVAL = 1000L // 断点状态保存间隔（毫秒）
     }
     
     /**
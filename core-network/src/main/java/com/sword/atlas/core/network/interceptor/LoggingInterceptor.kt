@@ -4,6 +4,8 @@ import com.sword.atlas.core.common.util.LogUtil
 import com.sword.atlas.core.network.BuildConfig
 import com.sword.atlas.core.network.config.NetworkConfig
 import okhttp3.Interceptor
+import okhttp3.MediaType
+import okhttp3.Request
 import okhttp3.Response
 import okio.Buffer
 import java.nio.charset.Charset
@@ -28,6 +30,13 @@ class LoggingInterceptor : Interceptor {
             BODY     // 包含请求体和响应体
         }
         
+        /**
+         * 会记录响应体的application类型子类型（含 +json、+xml 后缀）
+         */
+        private val TEXT_SUBTYPES = listOf(
+            "json", "xml", "html", "javascript", "x-www-form-urlencoded"
+        )
+        
         /**
          * 敏感信息关键字
          */
@@ -36,7 +45,46 @@ class LoggingInterceptor : Interceptor {
             "pwd", "pass", "auth", "credential", "signature"
         )
         
-
+        /**
+         * 耗时记录中的请求结果
+         */
+        private const val RESULT_OK = "ok"
+        private const val RESULT_ERROR = "error"
+        private const val RESULT_FAILED = "failed"
+        
+        /**
+         * 格式化结构化耗时记录
+         * 格式: ts=1729328400123 kind=http method=GET host=api.example.com path=/v1/user status=200 result=ok duration_ms=123
+         * 只记录路径不记录查询参数，避免敏感信息进入日志
+         *
+         * @param status HTTP状态码，请求失败（无响应）时为0
+         * @param result 请求结果：ok / error / failed
+         * @param startTime 请求开始时间戳（毫秒）
+         * @param durationMs 请求耗时（毫秒）
+         */
+        internal fun formatTiming(
+            request: Request,
+            status: Int,
+            result: String,
+            startTime: Long,
+            durationMs: Long
+        ): String {
+            return "ts=$startTime kind=http method=${request.method} host=${request.url.host} " +
+                "path=${request.url.encodedPath} status=$status result=$result duration_ms=$durationMs"
+        }
+        
+        /**
+         * 响应体类型是否为可记录的文本（text类型、JSON、XML、表单等）
+         * 
+         * @param contentType 响应体类型，未声明时交给isPlaintext判断，预读大小仍受MAX_BODY_LOG_BYTES限制
+         */
+        internal fun isTextContentType(contentType: MediaType?): Boolean {
+            if (contentType == null || contentType.type == "text") {
+                return true
+            }
+            val subtype = contentType.subtype.lowercase()
+            return TEXT_SUBTYPES.any { subtype == it || subtype.endsWith("+$it") }
+        }
     }
     
     private val logLevel: LogLevel = if (BuildConfig.DEBUG) LogLevel.BODY else LogLevel.BASIC
@@ -91,10 +139,18 @@ class LoggingInterceptor : Interceptor {
         } catch (e: Exception) {
             val duration = System.currentTimeMillis() - startTime
             LogUtil.e("← HTTP FAILED (${duration}ms): ${e.message}", e, TAG)
+            logTiming(request, 0, RESULT_FAILED, startTime, duration)
             throw e
         }
         
         val duration = System.currentTimeMillis() - startTime
+        logTiming(
+            request,
+            response.code,
+            if (response.isSuccessful) RESULT_OK else RESULT_ERROR,
+            startTime,
+            duration
+        )
         
         // 记录响应信息
         if (logLevel != LogLevel.NONE) {
@@ -110,9 +166,22 @@ class LoggingInterceptor : Interceptor {
             if (logLevel >= LogLevel.BODY) {
                 // 记录响应体
                 response.body?.let { responseBody ->
+                    // 分段下载、二进制内容和大文件不缓冲响应体，避免把下载内容读入内存
+                    val contentLength = responseBody.contentLength()
+                    if (response.code == 206 ||
+                        contentLength > NetworkConfig.Log.MAX_BODY_LOG_BYTES ||
+                        !isTextContentType(responseBody.contentType())
+                    ) {
+                        LogUtil.d("Response Body: [Skipped ${responseBody.contentType()} $contentLength bytes]", TAG)
+                        return@let
+                    }
                     try {
                         val source = responseBody.source()
-                        source.request(Long.MAX_VALUE)
+                        // 长度未知（chunked、gzip）时最多预读上限+1字节，超过上限不输出
+                        if (source.request(NetworkConfig.Log.MAX_BODY_LOG_BYTES + 1)) {
+                            LogUtil.d("Response Body: [Skipped, larger than ${NetworkConfig.Log.MAX_BODY_LOG_BYTES} bytes]", TAG)
+                            return@let
+                        }
                         val buffer = source.buffer
                         
                         val contentType = responseBody.contentType()
@@ -137,6 +206,13 @@ class LoggingInterceptor : Interceptor {
         return response
     }
     
+    /**
+     * 输出结构化耗时记录，供 scripts/latency_report.py 统计延迟分布
+     */
+    private fun logTiming(request: Request, status: Int, result: String, startTime: Long, durationMs: Long) {
+        LogUtil.i(formatTiming(request, status, result, startTime, durationMs), NetworkConfig.Log.TIMING_TAG)
+    }
+    
     /**
      * 过滤敏感请求头信息
      */
@@ -2,19 +2,50 @@ package com.sword.atlas.core.network.manager
 
 import com.sword.atlas.core.common.util.LogUtil
 import com.sword.atlas.core.network.config.NetworkConfig
+import com.sword.atlas.core.network.interceptor.LoggingInterceptor
+import com.sword.atlas.core.network.security.CryptoUtil
+import kotlinx.coroutines.CancellationException
+import kotlinx.coroutines.CoroutineStart
 import kotlinx.coroutines.Dispatchers
+import kotlinx.coroutines.NonCancellable
+import kotlinx.coroutines.async
+import kotlinx.coroutines.awaitAll
+import kotlinx.coroutines.awaitCancellation
+import kotlinx.coroutines.cancelAndJoin
+import kotlinx.coroutines.coroutineScope
+import kotlinx.coroutines.currentCoroutineContext
+import kotlinx.coroutines.delay
+import kotlinx.coroutines.ensureActive
 import kotlinx.coroutines.flow.Flow
-import kotlinx.coroutines.flow.flow
+import kotlinx.coroutines.flow.channelFlow
 import kotlinx.coroutines.flow.flowOn
+import kotlinx.coroutines.isActive
+import kotlinx.coroutines.launch
+import kotlinx.coroutines.withContext
+import okhttp3.Call
 import okhttp3.OkHttpClient
 import okhttp3.Request
+import okhttp3.Response
+import java.io.EOFException
 import java.io.File
 import java.io.FileOutputStream
-import java.io.InputStream
+import java.io.IOException
+import java.io.RandomAccessFile
+import java.nio.ByteBuffer
+import java.nio.channels.FileChannel
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.atomic.AtomicBoolean
 
 /**
  * 下载管理器
- * 支持下载进度监听
+ * 
+ * 支持下载进度监听、断点续传、多分段并行下载和SHA-256校验：
+ * - 服务器支持Range请求时，文件按字节拆分为多个分段并行下载，写入目标文件旁的.part临时文件，
+ *   各分段进度定期保存到.part.state，取消、断网或进程被杀后再次下载会从断点继续
+ * - 服务器不支持Range请求时退化为单连接下载
+ * - 下载完成并通过校验后，.part文件才会重命名为目标文件
+ * 
+ * 同一个目标文件同时只能有一个下载任务
  */
 class DownloadManager(
     private val okHttpClient: OkHttpClient
@@ -22,6 +53,10 @@ class DownloadManager(
     
     companion object {
         private const val TAG = "DownloadManager"
+        private const val PART_SUFFIX = ".part"
+        private const val STATE_SUFFIX = ".part.state"
+        private const val HTTP_PARTIAL_CONTENT = 206
+        private const val HTTP_RANGE_NOT_SATISFIABLE = 416
     }
     
     /**
@@ -57,81 +92,452 @@ class DownloadManager(
         data class Error(val message: String, val exception: Exception? = null) : DownloadResult()
     }
     
+    /**
+     * 服务器上的文件与断点记录不一致，需要从头下载
+     */
+    private class ResourceChangedException(message: String) : Exception(message)
+    
+    /**
+     * HTTP状态码错误，客户端错误（4xx）重试也不会成功
+     */
+    private class HttpStatusException(val code: Int) : IOException("HTTP $code") {
+        val isRetryable: Boolean
+            get() = code >= 500 || code == 408 || code == 429
+    }
+    
+    /**
+     * 支持Range请求的远程文件信息
+     */
+    private class RemoteFile(val totalBytes: Long, val validator: String)
+    
+    /**
+     * 下载专用的OkHttpClient
+     * 
+     * 与主客户端共享连接池和超时配置，但：
+     * - 只保留日志拦截器（记录耗时，不缓冲下载内容）。ErrorHandlingInterceptor会把连接异常
+     *   转换成伪造状态码的响应，使断点重试无法识别真实的IO错误；Token、签名等业务拦截器
+     *   也不应附加到CDN等下载地址上
+     * - 不限制整体调用时长（大文件下载时间不可预期），也不写入HTTP缓存
+     */
+    private val transferClient: OkHttpClient by lazy {
+        okHttpClient.newBuilder()
+            .apply { interceptors().retainAll { it is LoggingInterceptor } }
+            .callTimeout(0, TimeUnit.MILLISECONDS)
+            .cache(null)
+            .build()
+    }
+    
     /**
      * 下载文件
      * 
      * @param url 下载URL
      * @param destFile 目标文件
+     * @param expectedSha256 期望的SHA-256（十六进制），为null时不校验
+     * @param parallelism 最大并行分段数，1表示单连接（仍支持断点续传）
      * @return Flow<DownloadResult> 下载结果Flow
      */
-    fun download(url: String, destFile: File): Flow<DownloadResult> = flow {
+    fun download(
+        url: String,
+        destFile: File,
+        expectedSha256: String? = null,
+        parallelism: Int = NetworkConfig.Transfer.DOWNLOAD_PARALLELISM
+    ): Flow<DownloadResult> = channelFlow {
+        val partFile = partFileOf(destFile)
+        val stateFile = stateFileOf(destFile)
+        val onProgress: suspend (DownloadProgress) -> Unit = { send(DownloadResult.Progress(it)) }
+        
         try {
-            // 创建请求
-            val request = Request.Builder()
-                .url(url)
-                .build()
+            // 确保目标文件的父目录存在
+            destFile.parentFile?.mkdirs()
             
-            // 执行请求
-            val response = okHttpClient.newCall(request).execute()
+            val remoteFile = retryIo("探测") { probe(url) }
+            if (remoteFile == null) {
+                LogUtil.d("服务器不支持Range请求，使用单连接下载: $url", TAG)
+                stateFile.delete()
+                retryIo("下载") { downloadSingle(url, partFile, onProgress) }
+            } else {
+                val state = loadState(url, remoteFile, partFile, stateFile)
+                    ?: createState(url, remoteFile, partFile, stateFile, parallelism)
+                downloadSegments(url, state, partFile, stateFile, onProgress)
+            }
             
-            if (!response.isSuccessful) {
-                emit(DownloadResult.Error("下载失败: HTTP ${response.code}"))
-                return@flow
+            // 校验文件；读取失败时抛出IOException，保留.part以便重试
+            if (expectedSha256 != null) {
+                val actualSha256 = CryptoUtil.sha256(partFile)
+                if (!actualSha256.equals(expectedSha256, ignoreCase = true)) {
+                    clearPartial(destFile)
+                    LogUtil.e("文件校验失败: 期望 $expectedSha256，实际 $actualSha256", tag = TAG)
+                    send(DownloadResult.Error("文件校验失败: SHA-256不匹配"))
+                    return@channelFlow
+                }
             }
             
-            val body = response.body
-            if (body == null) {
-                emit(DownloadResult.Error("响应体为空"))
-                return@flow
+            if (destFile.exists() && !destFile.delete()) {
+                throw IOException("无法覆盖目标文件: ${destFile.absolutePath}")
+            }
+            if (!partFile.renameTo(destFile)) {
+                throw IOException("无法重命名临时文件: ${partFile.absolutePath}")
             }
+            stateFile.delete()
+            
+            // 下载完成
+            LogUtil.d("下载完成: ${destFile.absolutePath}", TAG)
+            send(DownloadResult.Success(destFile))
             
+        } catch (e: CancellationException) {
+            // 取消时保留.part和断点状态，下次下载从断点继续
+            throw e
+        } catch (e: ResourceChangedException) {
+            clearPartial(destFile)
+            LogUtil.e("下载失败: ${e.message}", e, TAG)
+            send(DownloadResult.Error("下载失败: ${e.message}", e))
+        } catch (e: Exception) {
+            LogUtil.e("下载失败: ${e.message}", e, TAG)
+            send(DownloadResult.Error("下载失败: ${e.message}", e))
+        }
+    }.flowOn(Dispatchers.IO)
+    
+    /**
+     * 取消下载
+     * 注意：需要在协程中取消Flow的收集来实现取消下载，
+     * 已下载的分段会保留，下次下载同一目标文件时从断点继续
+     */
+    fun cancelDownload() {
+        // Flow的取消由协程的取消来实现
+        // 调用者需要取消收集Flow的协程
+    }
+    
+    /**
+     * 删除未完成下载的临时文件和断点状态，下次下载从头开始
+     * 
+     * @param destFile 目标文件
+     */
+    fun clearPartial(destFile: File) {
+        partFileOf(destFile).delete()
+        stateFileOf(destFile).delete()
+    }
+    
+    private fun partFileOf(destFile: File) = File(destFile.path + PART_SUFFIX)
+    
+    private fun stateFileOf(destFile: File) = File(destFile.path + STATE_SUFFIX)
+    
+    /**
+     * 探测服务器是否支持Range请求
+     * 
+     * @return 支持时返回文件大小和校验信息，不支持时返回null
+     */
+    private suspend fun probe(url: String): RemoteFile? {
+        val request = Request.Builder()
+            .url(url)
+            .header("Range", "bytes=0-0")
+            .build()
+        
+        return transferClient.newCall(request).executeCancellable { response ->
+            if (response.code != HTTP_PARTIAL_CONTENT) {
+                if (!response.isSuccessful && response.code != HTTP_RANGE_NOT_SATISFIABLE) {
+                    throw HttpStatusException(response.code)
+                }
+                return@executeCancellable null
+            }
+            val range = DownloadState.parseContentRange(response.header("Content-Range"))
+                ?: return@executeCancellable null
+            // 弱ETag不能用于If-Range，改用Last-Modified
+            val validator = response.header("ETag")?.takeUnless { it.startsWith("W/") }
+                ?: response.header("Last-Modified")
+                ?: ""
+            RemoteFile(range.total, validator)
+        }
+    }
+    
+    /**
+     * 读取断点状态，与服务器上的文件不一致时返回null
+     */
+    private fun loadState(url: String, remoteFile: RemoteFile, partFile: File, stateFile: File): DownloadState? {
+        if (!stateFile.exists() || partFile.length() != remoteFile.totalBytes) {
+            return null
+        }
+        val state = DownloadState.decode(stateFile.readText()) ?: return null
+        if (!state.matches(url, remoteFile.totalBytes, remoteFile.validator)) {
+            LogUtil.d("服务器文件已变化，重新下载: $url", TAG)
+            return null
+        }
+        LogUtil.d("从断点继续下载: ${state.downloadedBytes}/${state.totalBytes} bytes", TAG)
+        return state
+    }
+    
+    /**
+     * 创建新的断点状态并预分配临时文件
+     */
+    private fun createState(
+        url: String,
+        remoteFile: RemoteFile,
+        partFile: File,
+        stateFile: File,
+        parallelism: Int
+    ): DownloadState {
+        val state = DownloadState.create(
+            url,
+            remoteFile.totalBytes,
+            remoteFile.validator,
+            parallelism,
+            NetworkConfig.Transfer.MIN_SEGMENT_SIZE
+        )
+        partFile.delete()
+        RandomAccessFile(partFile, "rw").use { it.setLength(remoteFile.totalBytes) }
+        stateFile.writeText(state.encode())
+        return state
+    }
+    
+    /**
+     * 并行下载所有未完成的分段
+     */
+    private suspend fun downloadSegments(
+        url: String,
+        state: DownloadState,
+        partFile: File,
+        stateFile: File,
+        onProgress: suspend (DownloadProgress) -> Unit
+    ) = coroutineScope {
+        RandomAccessFile(partFile, "rw").use { file ->
+            val channel = file.channel
+            
+            // 定期汇报进度并保存断点状态
+            val reporter = launch {
+                var lastSaveTime = System.currentTimeMillis()
+                while (isActive) {
+                    delay(NetworkConfig.Transfer.PROGRESS_UPDATE_INTERVAL)
+                    onProgress(progressOf(state.downloadedBytes, state.totalBytes))
+                    if (System.currentTimeMillis() - lastSaveTime >= NetworkConfig.Transfer.STATE_SAVE_INTERVAL) {
+                        saveState(state, channel, stateFile)
+                        lastSaveTime = System.currentTimeMillis()
+                    }
+                }
+            }
+            
+            try {
+                state.segments
+                    .filterNot { it.isComplete }
+                    .map { segment -> async { downloadSegment(url, state.validator, segment, channel) } }
+                    .awaitAll()
+            } finally {
+                withContext(NonCancellable) {
+                    // 等待进度协程退出后再保存，避免与其并发写状态文件或在文件关闭后访问
+                    reporter.cancelAndJoin()
+                    saveState(state, channel, stateFile)
+                }
+            }
+        }
+        onProgress(progressOf(state.downloadedBytes, state.totalBytes))
+    }
+    
+    /**
+     * 下载单个分段，连接中断时从已写入的位置重试
+     */
+    private suspend fun downloadSegment(
+        url: String,
+        validator: String,
+        segment: DownloadState.Segment,
+        channel: FileChannel
+    ) {
+        var downloadedBefore = segment.downloaded
+        val madeProgress = {
+            (segment.downloaded > downloadedBefore).also { downloadedBefore = segment.downloaded }
+        }
+        retryIo("分段下载", madeProgress) {
+            fetchRange(url, validator, segment, channel)
+        }
+    }
+    
+    /**
+     * 按NetworkConfig.Retry的指数退避执行IO操作
+     * 
+     * @param description 操作描述，用于日志
+     * @param madeProgress 本次失败前是否有进展；有进展时重置重试计数，只有连续失败才放弃
+     * @param block IO操作
+     */
+    private suspend fun <T> retryIo(
+        description: String,
+        madeProgress: () -> Boolean = { false },
+        block: suspend () -> T
+    ): T {
+        var attempt = 0
+        var retryDelay = NetworkConfig.Retry.INITIAL_DELAY
+        while (true) {
+            try {
+                return block()
+            } catch (e: IOException) {
+                // 取消导致的调用中断不再重试
+                currentCoroutineContext().ensureActive()
+                if (e is HttpStatusException && !e.isRetryable) {
+                    throw e
+                }
+                if (madeProgress()) {
+                    attempt = 0
+                    retryDelay = NetworkConfig.Retry.INITIAL_DELAY
+                }
+                if (++attempt > NetworkConfig.Retry.MAX_RETRIES) {
+                    throw e
+                }
+                LogUtil.w("${description}中断，${retryDelay}ms后重试: ${e.message}", TAG)
+                delay(retryDelay)
+                retryDelay = (retryDelay * NetworkConfig.Retry.MULTIPLIER).toLong()
+                    .coerceAtMost(NetworkConfig.Retry.MAX_DELAY)
+            }
+        }
+    }
+    
+    /**
+     * 请求分段剩余的字节并写入临时文件的对应位置
+     */
+    private suspend fun fetchRange(
+        url: String,
+        validator: String,
+        segment: DownloadState.Segment,
+        channel: FileChannel
+    ) {
+        val builder = Request.Builder()
+            .url(url)
+            .header("Range", "bytes=${segment.nextOffset}-${segment.end}")
+        if (validator.isNotEmpty()) {
+            // 文件已变化时服务器返回200和完整内容，而不是把新旧数据拼在一起
+            builder.header("If-Range", validator)
+        }
+        
+        transferClient.newCall(builder.build()).executeCancellable { response ->
+            val range = DownloadState.parseContentRange(response.header("Content-Range"))
+            if (response.code == HTTP_PARTIAL_CONTENT && range?.start != segment.nextOffset) {
+                throw ResourceChangedException("服务器返回的分段与请求不一致")
+            }
+            if (response.code != HTTP_PARTIAL_CONTENT) {
+                if (response.isSuccessful || response.code == HTTP_RANGE_NOT_SATISFIABLE) {
+                    throw ResourceChangedException("服务器文件已变化 (HTTP ${response.code})")
+                }
+                throw HttpStatusException(response.code)
+            }
+            
+            val body = response.body ?: throw IOException("响应体为空")
+            body.byteStream().use { inputStream ->
+                val buffer = ByteArray(NetworkConfig.Transfer.BUFFER_SIZE.toInt())
+                while (!segment.isComplete) {
+                    currentCoroutineContext().ensureActive()
+                    val remaining = segment.length - segment.downloaded
+                    val bytesRead = inputStream.read(buffer, 0, minOf(buffer.size.toLong(), remaining).toInt())
+                    if (bytesRead == -1) {
+                        throw EOFException("分段数据提前结束")
+                    }
+                    val byteBuffer = ByteBuffer.wrap(buffer, 0, bytesRead)
+                    var position = segment.nextOffset
+                    while (byteBuffer.hasRemaining()) {
+                        position += channel.write(byteBuffer, position)
+                    }
+                    segment.advance(bytesRead.toLong())
+                }
+            }
+        }
+    }
+    
+    /**
+     * 执行请求并处理响应
+     * 
+     * execute()和响应体读取都是阻塞调用，只在两次读取之间检查取消时，链路停滞会让取消
+     * 一直等到readTimeout。协程被取消时直接取消OkHttp调用，阻塞中的连接或读取立即以
+     * IOException结束
+     */
+    private suspend fun <T> Call.executeCancellable(block: suspend (Response) -> T): T = coroutineScope {
+        val call = this@executeCancellable
+        val finished = AtomicBoolean(false)
+        val watcher = launch(start = CoroutineStart.UNDISPATCHED) {
+            try {
+                awaitCancellation()
+            } finally {
+                // 正常结束时不取消，避免连接无法复用
+                if (!finished.get()) {
+                    call.cancel()
+                }
+            }
+        }
+        try {
+            call.execute().use { response -> block(response) }
+        } finally {
+            finished.set(true)
+            watcher.cancel()
+        }
+    }
+    
+    /**
+     * 保存断点状态
+     * 
+     * 先记录进度再把数据刷到磁盘，保证状态文件中的进度不超过已落盘的数据；
+     * 通过临时文件替换，避免写入中途被杀留下损坏的状态
+     */
+    private fun saveState(state: DownloadState, channel: FileChannel, stateFile: File) {
+        val content = state.encode()
+        channel.force(false)
+        val tempFile = File(stateFile.path + ".tmp")
+        tempFile.writeText(content)
+        if (!tempFile.renameTo(stateFile)) {
+            stateFile.delete()
+            tempFile.renameTo(stateFile)
+        }
+    }
+    
+    /**
+     * 单连接下载（服务器不支持Range请求时使用）
+     */
+    private suspend fun downloadSingle(
+        url: String,
+        partFile: File,
+        onProgress: suspend (DownloadProgress) -> Unit
+    ) {
+        // 创建请求
+        val request = Request.Builder()
+            .url(url)
+            .build()
+        
+        // 执行请求
+        transferClient.newCall(request).executeCancellable { response ->
+            if (!response.isSuccessful) {
+                throw HttpStatusException(response.code)
+            }
+            
+            val body = response.body ?: throw IOException("响应体为空")
             val totalBytes = body.contentLength()
             var bytesDownloaded = 0L
-            
-            // 确保目标文件的父目录存在
-            destFile.parentFile?.mkdirs()
+            var lastProgressTime = 0L
             
             // 写入文件
             body.byteStream().use { inputStream ->
-                FileOutputStream(destFile).use { outputStream ->
+                FileOutputStream(partFile).use { outputStream ->
                     val buffer = ByteArray(NetworkConfig.Transfer.BUFFER_SIZE.toInt())
                     var bytesRead: Int
                     
                     while (inputStream.read(buffer).also { bytesRead = it } != -1) {
+                        currentCoroutineContext().ensureActive()
                         outputStream.write(buffer, 0, bytesRead)
                         bytesDownloaded += bytesRead
                         
-                        // 计算进度
-                        val progress = if (totalBytes > 0) {
-                            ((bytesDownloaded * 100) / totalBytes).toInt()
-                        } else {
-                            0
+                        // 按间隔发送进度
+                        val now = System.currentTimeMillis()
+                        if (now - lastProgressTime >= NetworkConfig.Transfer.PROGRESS_UPDATE_INTERVAL) {
+                            lastProgressTime = now
+                            onProgress(progressOf(bytesDownloaded, totalBytes))
                         }
-                        
-                        // 发送进度
-                        emit(DownloadResult.Progress(
-                            DownloadProgress(bytesDownloaded, totalBytes, progress)
-                        ))
                     }
                 }
             }
-            
-            // 下载完成
-            LogUtil.d("下载完成: ${destFile.absolutePath}", TAG)
-            emit(DownloadResult.Success(destFile))
-            
-        } catch (e: Exception) {
-            LogUtil.e("下载失败: ${e.message}", e, TAG)
-            emit(DownloadResult.Error("下载失败: ${e.message}", e))
+            onProgress(progressOf(bytesDownloaded, totalBytes))
         }
-    }.flowOn(Dispatchers.IO)
+    }
     
     /**
-     * 取消下载
-     * 注意：需要在协程中取消Flow的收集来实现取消下载
+     * 计算进度
      */
-    fun cancelDownload() {
-        // Flow的取消由协程的取消来实现
-        // 调用者需要取消收集Flow的协程
+    private fun progressOf(bytesDownloaded: Long, totalBytes: Long): DownloadProgress {
+        val progress = if (totalBytes > 0) {
+            ((bytesDownloaded * 100) / totalBytes).toInt()
+        } else {
+            0
+        }
+        return DownloadProgress(bytesDownloaded, totalBytes, progress)
     }
 }
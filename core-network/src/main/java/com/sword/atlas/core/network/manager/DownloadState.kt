@@ -0,0 +1,215 @@
+package com.sword.atlas.core.network.manager
+
+import java.util.concurrent.atomic.AtomicLong
+
+/**
+ * 分段下载的断点状态
+ * 
+ * 与.part临时文件一起保存在目标文件旁，记录资源校验信息和每个分段已写入的字节数，
+ * 进程被杀或下载被取消后可以从断点继续。使用简单的行格式，不依赖反射序列化
+ * 
+ * @property url 下载URL
+ * @property totalBytes 文件总字节数
+ * @property validator 服务器返回的ETag或Last-Modified，资源变化后状态作废
+ * @property segments 下载分段
+ */
+internal class DownloadState(
+    val url: String,
+    val totalBytes: Long,
+    val validator: String,
+    val segments: List<Segment>
+) {
+    
+    /**
+     * 下载分段，对应闭区间 [start, end]
+     * 
+     * @property start 起始偏移
+     * @property end 结束偏移（包含）
+     */
+    class Segment(val start: Long, val end: Long, downloaded: Long = 0L) {
+        
+        private val written = AtomicLong(downloaded)
+        
+        /**
+         * 已写入的字节数，由下载协程更新、进度协程读取
+         */
+        val downloaded: Long
+            get() = written.get()
+        
+        val length: Long
+            get() = end - start + 1
+        
+        val isComplete: Boolean
+            get() = downloaded >= length
+        
+        /**
+         * 下一次请求的起始偏移
+         */
+        val nextOffset: Long
+            get() = start + downloaded
+        
+        fun advance(bytes: Long) {
+            written.addAndGet(bytes)
+        }
+    }
+    
+    /**
+     * 已下载的总字节数
+     */
+    val downloadedBytes: Long
+        get() = segments.sumOf { it.downloaded }
+    
+    val isComplete: Boolean
+        get() = segments.all { it.isComplete }
+    
+    /**
+     * 断点状态是否仍对应服务器上的同一个文件
+     */
+    fun matches(url: String, totalBytes: Long, validator: String): Boolean {
+        return this.url == url && this.totalBytes == totalBytes && this.validator == validator
+    }
+    
+    /**
+     * 序列化为文本
+     */
+    fun encode(): String = buildString {
+        append(HEADER).append('\n')
+        append("url=").append(url).append('\n')
+        append("total=").append(totalBytes).append('\n')
+        append("validator=").append(validator).append('\n')
+        segments.forEach { segment ->
+            append("segment=${segment.start},${segment.end},${segment.downloaded}\n")
+        }
+    }
+    
+    companion object {
+        private const val HEADER = "atlas-download-state 1"
+        
+        /**
+         * 创建新的下载状态
+         */
+        fun create(
+            url: String,
+            totalBytes: Long,
+            validator: String,
+            parallelism: Int,
+            minSegmentSize: Long
+        ): DownloadState {
+            return DownloadState(url, totalBytes, validator, split(totalBytes, parallelism, minSegmentSize))
+        }
+        
+        /**
+         * 将文件按字节均分为若干连续分段
+         * 
+         * 分段数不超过parallelism，且每段不小于minSegmentSize，小文件只有一个分段
+         * 
+         * @param totalBytes 文件总字节数
+         * @param parallelism 最大分段数
+         * @param minSegmentSize 分段最小字节数
+         * @return 覆盖 [0, totalBytes) 的分段列表
+         */
+        fun split(totalBytes: Long, parallelism: Int, minSegmentSize: Long): List<Segment> {
+            if (totalBytes <= 0) {
+                return emptyList()
+            }
+            val bySize = totalBytes / minSegmentSize.coerceAtLeast(1)
+            val count = bySize.coerceIn(1L, parallelism.coerceAtLeast(1).toLong()).toInt()
+            val baseSize = totalBytes / count
+            val remainder = totalBytes % count
+            
+            val segments = ArrayList<Segment>(count)
+            var start = 0L
+            for (index in 0 until count) {
+                // 余数分摊给前面的分段
+                val size = baseSize + if (index < remainder) 1 else 0
+                segments.add(Segment(start, start + size - 1))
+                start += size
+            }
+            return segments
+        }
+        
+        /**
+         * 解析断点状态
+         * 
+         * @return 格式不正确或分段不连续时返回null，调用方应重新开始下载
+         */
+        fun decode(text: String): DownloadState? {
+            val lines = text.lines().filter { it.isNotEmpty() }
+            if (lines.firstOrNull() != HEADER) {
+                return null
+            }
+            var url: String? = null
+            var totalBytes: Long? = null
+            var validator: String? = null
+            val segments = mutableListOf<Segment>()
+            for (line in lines.drop(1)) {
+                val key = line.substringBefore('=')
+                val value = line.substringAfter('=', "")
+                when (key) {
+                    "url" -> url = value
+                    "total" -> totalBytes = value.toLongOrNull()
+                    "validator" -> validator = value
+                    "segment" -> {
+                        val parts = value.split(',').map { it.toLongOrNull() ?: return null }
+                        if (parts.size != 3) {
+                            return null
+                        }
+                        val (start, end, downloaded) = parts
+                        if (end < start || downloaded < 0 || downloaded > end - start + 1) {
+                            return null
+                        }
+                        segments.add(Segment(start, end, downloaded))
+                    }
+                    else -> return null
+                }
+            }
+            val total = totalBytes ?: return null
+            if (url == null || validator == null || segments.isEmpty()) {
+                return null
+            }
+            // 分段必须从0开始首尾相接地覆盖整个文件
+            var expectedStart = 0L
+            for (segment in segments) {
+                if (segment.start != expectedStart) {
+                    return null
+                }
+                expectedStart = segment.end + 1
+            }
+            if (expectedStart != total) {
+                return null
+            }
+            return DownloadState(url, total, validator, segments)
+        }
+        
+        /**
+         * 解析Content-Range响应头，例如 "bytes 0-1023/4096"
+         * 
+         * @return 解析结果；格式不正确或总大小未知（"*"）时返回null
+         */
+        fun parseContentRange(value: String?): ContentRange? {
+            val match = CONTENT_RANGE_REGEX.matchEntire(value?.trim() ?: return null) ?: return null
+            val (start, end, total) = match.destructured
+            val range = ContentRange(
+                start.toLongOrNull() ?: return null,
+                end.toLongOrNull() ?: return null,
+                total.toLongOrNull() ?: return null
+            )
+            return range.takeIf { it.start <= it.end && it.end < it.total }
+        }
+        
+        private val CONTENT_RANGE_REGEX = Regex("""bytes\s+(\d+)-(\d+)/(\d+)""", RegexOption.IGNORE_CASE)
+    }
+}
+
+/**
+ * Content-Range响应头的内容
+ * 
+ * @property start 起始偏移
+ * @property end 结束偏移（包含）
+ * @property total 文件总字节数
+ */
+internal data class ContentRange(
+    val start: Long,
+    val end: Long,
+    val total: Long
+)
@@ -1,5 +1,7 @@
 package com.sword.atlas.core.network.security
 
+import java.io.File
+import java.io.IOException
 import java.security.MessageDigest
 import javax.crypto.Mac
 import javax.crypto.spec.SecretKeySpec
@@ -45,6 +47,27 @@ object CryptoUtil {
         }
     }
     
+    /**
+     * 文件SHA-256哈希
+     * 
+     * 流式读取，不会把整个文件加载到内存
+     * 
+     * @param file 输入文件
+     * @return SHA-256哈希值（十六进制字符串）
+     * @throws IOException 文件不存在或读取失败时抛出，避免与哈希不匹配混淆
+     */
+    fun sha256(file: File): String {
+        val digest = MessageDigest.getInstance("SHA-256")
+        file.inputStream().use { inputStream ->
+            val buffer = ByteArray(DEFAULT_BUFFER_SIZE)
+            var bytesRead: Int
+            while (inputStream.read(buffer).also { bytesRead = it } != -1) {
+                digest.update(buffer, 0, bytesRead)
+            }
+        }
+        return digest.digest().joinToString("") { "%02x".format(it) }
+    }
+    
     /**
      * MD5哈希（已废弃，仅用于兼容旧系统）
      * 
@@ -0,0 +1,62 @@
+package com.sword.atlas.core.network.interceptor
+
+import okhttp3.MediaType.Companion.toMediaType
+import okhttp3.Request
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * LoggingInterceptor耗时记录格式和响应体类型判断单元测试
+ */
+class LoggingInterceptorTest {
+
+    @Test
+    fun `formatTiming should produce structured record`() {
+        // Given
+        val request = Request.Builder()
+            .url("https://api.example.com/v1/user/42")
+            .build()
+
+        // When
+        val record = LoggingInterceptor.formatTiming(request, 200, "ok", 1729328400123L, 123L)
+
+        // Then
+        assertEquals(
+            "ts=1729328400123 kind=http method=GET host=api.example.com path=/v1/user/42 status=200 result=ok duration_ms=123",
+            record
+        )
+    }
+
+    @Test
+    fun `formatTiming should not include query parameters`() {
+        // Given
+        val request = Request.Builder()
+            .url("https://api.example.com/v1/login?token=secret")
+            .build()
+
+        // When
+        val record = LoggingInterceptor.formatTiming(request, 0, "failed", 0L, 30000L)
+
+        // Then
+        assertFalse(record.contains("secret"))
+        assertTrue(record.contains("path=/v1/login "))
+        assertTrue(record.contains("status=0 result=failed"))
+    }
+
+    @Test
+    fun `isTextContentType should accept text and structured types`() {
+        assertTrue(LoggingInterceptor.isTextContentType(null))
+        assertTrue(LoggingInterceptor.isTextContentType("text/plain; charset=utf-8".toMediaType()))
+        assertTrue(LoggingInterceptor.isTextContentType("application/json".toMediaType()))
+        assertTrue(LoggingInterceptor.isTextContentType("application/problem+json".toMediaType()))
+        assertTrue(LoggingInterceptor.isTextContentType("application/x-www-form-urlencoded".toMediaType()))
+    }
+
+    @Test
+    fun `isTextContentType should reject binary types`() {
+        assertFalse(LoggingInterceptor.isTextContentType("application/octet-stream".toMediaType()))
+        assertFalse(LoggingInterceptor.isTextContentType("application/zip".toMediaType()))
+        assertFalse(LoggingInterceptor.isTextContentType("image/png".toMediaType()))
+        assertFalse(LoggingInterceptor.isTextContentType("video/mp4".toMediaType()))
+    }
+}
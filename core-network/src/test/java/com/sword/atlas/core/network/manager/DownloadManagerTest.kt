@@ -0,0 +1,301 @@
+package com.sword.atlas.core.network.manager
+
+import com.sword.atlas.core.network.config.NetworkConfig
+import io.mockk.every
+import io.mockk.mockkStatic
+import io.mockk.unmockkAll
+import kotlinx.coroutines.flow.first
+import kotlinx.coroutines.flow.toList
+import kotlinx.coroutines.test.runTest
+import okhttp3.OkHttpClient
+import okhttp3.mockwebserver.Dispatcher
+import okhttp3.mockwebserver.MockResponse
+import okhttp3.mockwebserver.MockWebServer
+import okhttp3.mockwebserver.RecordedRequest
+import okhttp3.mockwebserver.SocketPolicy
+import okio.Buffer
+import org.junit.After
+import org.junit.Assert.*
+import org.junit.Before
+import org.junit.Rule
+import org.junit.Test
+import org.junit.rules.TemporaryFolder
+import java.io.File
+import java.io.RandomAccessFile
+import java.security.MessageDigest
+import java.util.concurrent.CopyOnWriteArrayList
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.atomic.AtomicInteger
+import kotlin.random.Random
+
+/**
+ * DownloadManager单元测试
+ *
+ * 使用MockWebServer模拟支持Range / If-Range的下载服务器
+ */
+class DownloadManagerTest {
+
+    @get:Rule
+    val tempFolder = TemporaryFolder()
+
+    private lateinit var server: MockWebServer
+    private lateinit var manager: DownloadManager
+
+    @Before
+    fun setup() {
+        // Mock Android Log类
+        mockkStatic(android.util.Log::class)
+        every { android.util.Log.d(any(), any()) } returns 0
+        every { android.util.Log.w(any(), any<String>()) } returns 0
+        every { android.util.Log.e(any(), any()) } returns 0
+        every { android.util.Log.e(any(), any(), any()) } returns 0
+
+        server = MockWebServer()
+        server.start()
+        manager = DownloadManager(
+            OkHttpClient.Builder()
+                .readTimeout(5, TimeUnit.SECONDS)
+                .build()
+        )
+    }
+
+    @After
+    fun tearDown() {
+        server.shutdown()
+        unmockkAll()
+    }
+
+    @Test
+    fun `download should fetch segments in parallel and verify sha256`() = runTest {
+        // Given
+        val content = randomContent(2 * NetworkConfig.Transfer.MIN_SEGMENT_SIZE.toInt() + 512)
+        val rangeServer = RangeDispatcher(content).also { server.dispatcher = it }
+        val destFile = File(tempFolder.root, "payload.bin")
+
+        // When
+        val results = manager.download(url(), destFile, sha256(content), parallelism = 4).toList()
+
+        // Then
+        assertTrue(results.last() is DownloadManager.DownloadResult.Success)
+        assertArrayEquals(content, destFile.readBytes())
+        assertFalse(partFileOf(destFile).exists())
+        assertFalse(stateFileOf(destFile).exists())
+        val half = content.size / 2
+        assertEquals(
+            setOf("bytes=0-0", "bytes=0-${half - 1}", "bytes=$half-${content.size - 1}"),
+            rangeServer.ranges.toSet()
+        )
+    }
+
+    @Test
+    fun `download should resume from saved state`() = runTest {
+        // Given
+        val content = randomContent(64 * 1024)
+        val rangeServer = RangeDispatcher(content).also { server.dispatcher = it }
+        val destFile = File(tempFolder.root, "payload.bin")
+        val state = DownloadState.create(url(), content.size.toLong(), ETAG, 1, NetworkConfig.Transfer.MIN_SEGMENT_SIZE)
+        state.segments[0].advance(1000L)
+        partFileOf(destFile).outputStream().use { it.write(content, 0, 1000) }
+        RandomAccessFile(partFileOf(destFile), "rw").use { it.setLength(content.size.toLong()) }
+        stateFileOf(destFile).writeText(state.encode())
+
+        // When
+        val results = manager.download(url(), destFile, parallelism = 1).toList()
+
+        // Then
+        assertTrue(results.last() is DownloadManager.DownloadResult.Success)
+        assertArrayEquals(content, destFile.readBytes())
+        assertEquals(listOf("bytes=0-0", "bytes=1000-${content.size - 1}"), rangeServer.ranges)
+        assertEquals(ETAG, rangeServer.ifRanges.last())
+    }
+
+    @Test
+    fun `download should clear partial file when resource changes during download`() = runTest {
+        // Given: 探测后文件被替换，If-Range不匹配时服务器返回200和完整内容
+        val content = randomContent(64 * 1024)
+        server.enqueue(probeResponse(content.size))
+        server.enqueue(MockResponse().setBody(Buffer().write(content)))
+        val destFile = File(tempFolder.root, "payload.bin")
+
+        // When
+        val result = manager.download(url(), destFile, parallelism = 1).toList().last()
+
+        // Then
+        assertTrue(result is DownloadManager.DownloadResult.Error)
+        assertTrue((result as DownloadManager.DownloadResult.Error).message.contains("200"))
+        server.takeRequest()
+        assertEquals(ETAG, server.takeRequest().getHeader("If-Range"))
+        assertFalse(destFile.exists())
+        assertFalse(partFileOf(destFile).exists())
+        assertFalse(stateFileOf(destFile).exists())
+    }
+
+    @Test
+    fun `download should clear partial file when range is not satisfiable`() = runTest {
+        // Given
+        server.enqueue(probeResponse(64 * 1024))
+        server.enqueue(MockResponse().setResponseCode(416))
+        val destFile = File(tempFolder.root, "payload.bin")
+
+        // When
+        val result = manager.download(url(), destFile, parallelism = 1).toList().last()
+
+        // Then
+        assertTrue(result is DownloadManager.DownloadResult.Error)
+        assertTrue((result as DownloadManager.DownloadResult.Error).message.contains("416"))
+        assertFalse(partFileOf(destFile).exists())
+        assertFalse(stateFileOf(destFile).exists())
+    }
+
+    @Test
+    fun `download should fall back to single connection when probe returns 416`() = runTest {
+        // Given
+        val content = randomContent(16 * 1024)
+        server.enqueue(MockResponse().setResponseCode(416))
+        server.enqueue(MockResponse().setBody(Buffer().write(content)))
+        val destFile = File(tempFolder.root, "payload.bin")
+
+        // When
+        val result = manager.download(url(), destFile).toList().last()
+
+        // Then
+        assertTrue(result is DownloadManager.DownloadResult.Success)
+        assertArrayEquals(content, destFile.readBytes())
+        assertEquals("bytes=0-0", server.takeRequest().getHeader("Range"))
+        assertNull(server.takeRequest().getHeader("Range"))
+    }
+
+    @Test
+    fun `download should keep retrying while each attempt makes progress`() = runTest {
+        // Given: 连续断流次数超过MAX_RETRIES，但每次都写入了部分数据
+        val content = randomContent(64 * 1024)
+        val interruptions = NetworkConfig.Retry.MAX_RETRIES + 1
+        val rangeServer = RangeDispatcher(content, interruptions).also { server.dispatcher = it }
+        val destFile = File(tempFolder.root, "payload.bin")
+
+        // When
+        val result = manager.download(url(), destFile, parallelism = 1).toList().last()
+
+        // Then
+        assertTrue(result is DownloadManager.DownloadResult.Success)
+        assertArrayEquals(content, destFile.readBytes())
+        // 探测 + 每次断流后从已写入的位置继续
+        assertEquals(interruptions + 2, rangeServer.ranges.size)
+        assertEquals(
+            "bytes=${interruptions * TRUNCATED_BYTES}-${content.size - 1}",
+            rangeServer.ranges.last()
+        )
+    }
+
+    @Test
+    fun `cancel should keep partial file and next download should resume`() = runTest {
+        // Given
+        val content = randomContent(2 * 1024 * 1024)
+        val rangeServer = RangeDispatcher(content).also { server.dispatcher = it }
+        rangeServer.throttleBytes = 8 * 1024L
+        val destFile = File(tempFolder.root, "payload.bin")
+
+        // When: 收到第一次有进度的回调后取消收集
+        manager.download(url(), destFile, parallelism = 1).first {
+            it is DownloadManager.DownloadResult.Progress && it.progress.bytesDownloaded > 0
+        }
+
+        // Then
+        assertTrue(partFileOf(destFile).exists())
+        val saved = DownloadState.decode(stateFileOf(destFile).readText())
+        assertNotNull(saved)
+        val resumeOffset = saved!!.segments[0].nextOffset
+        assertTrue(resumeOffset > 0 && resumeOffset < content.size)
+
+        // When
+        rangeServer.throttleBytes = 0L
+        val result = manager.download(url(), destFile, parallelism = 1).toList().last()
+
+        // Then
+        assertTrue(result is DownloadManager.DownloadResult.Success)
+        assertArrayEquals(content, destFile.readBytes())
+        assertEquals("bytes=$resumeOffset-${content.size - 1}", rangeServer.ranges.last())
+    }
+
+    private fun url() = server.url("/payload.bin").toString()
+
+    private fun partFileOf(destFile: File) = File(destFile.path + ".part")
+
+    private fun stateFileOf(destFile: File) = File(destFile.path + ".part.state")
+
+    private fun randomContent(size: Int) = Random(size).nextBytes(size)
+
+    private fun sha256(content: ByteArray): String {
+        return MessageDigest.getInstance("SHA-256").digest(content).joinToString("") { "%02x".format(it) }
+    }
+
+    private fun probeResponse(totalBytes: Int): MockResponse {
+        return MockResponse()
+            .setResponseCode(206)
+            .setHeader("ETag", ETAG)
+            .setHeader("Content-Range", "bytes 0-0/$totalBytes")
+            .setBody("x")
+    }
+
+    /**
+     * 按Range / If-Range返回文件内容的服务器
+     *
+     * @param content 文件内容
+     * @param interruptions 前几次分段请求只发送TRUNCATED_BYTES字节后断开连接
+     */
+    private class RangeDispatcher(
+        private val content: ByteArray,
+        interruptions: Int = 0
+    ) : Dispatcher() {
+
+        private val remainingInterruptions = AtomicInteger(interruptions)
+
+        /**
+         * 每100ms发送的字节数，0表示不限速
+         */
+        @Volatile
+        var throttleBytes = 0L
+
+        val ranges = CopyOnWriteArrayList<String>()
+        val ifRanges = CopyOnWriteArrayList<String>()
+
+        override fun dispatch(request: RecordedRequest): MockResponse {
+            val range = request.getHeader("Range")
+            val match = range?.let { RANGE_REGEX.matchEntire(it) }
+            request.getHeader("If-Range")?.let { ifRanges.add(it) }
+            if (match == null || request.getHeader("If-Range").let { it != null && it != ETAG }) {
+                return MockResponse().setHeader("ETag", ETAG).setBody(Buffer().write(content))
+            }
+            ranges.add(range)
+
+            val start = match.groupValues[1].toInt()
+            val end = minOf(match.groupValues[2].toInt(), content.size - 1)
+            if (start >= content.size) {
+                return MockResponse().setResponseCode(416)
+            }
+            val length = end - start + 1
+            val response = MockResponse()
+                .setResponseCode(206)
+                .setHeader("ETag", ETAG)
+                .setHeader("Content-Range", "bytes $start-$end/${content.size}")
+            if (length > TRUNCATED_BYTES && remainingInterruptions.getAndDecrement() > 0) {
+                // 声明完整长度，只发送一部分后断开
+                return response
+                    .setBody(Buffer().write(content, start, TRUNCATED_BYTES))
+                    .setHeader("Content-Length", length)
+                    .setSocketPolicy(SocketPolicy.DISCONNECT_AT_END)
+            }
+            response.setBody(Buffer().write(content, start, length))
+            if (throttleBytes > 0) {
+                response.throttleBody(throttleBytes, 100, TimeUnit.MILLISECONDS)
+            }
+            return response
+        }
+    }
+
+    companion object {
+        private const val ETAG = "\"v1\""
+        private const val TRUNCATED_BYTES = 4096
+        private val RANGE_REGEX = Regex("""bytes=(\d+)-(\d+)""")
+    }
+}
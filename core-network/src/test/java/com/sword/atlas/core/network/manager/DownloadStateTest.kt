@@ -0,0 +1,95 @@
+package com.sword.atlas.core.network.manager
+
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * DownloadState分段与断点状态单元测试
+ */
+class DownloadStateTest {
+
+    @Test
+    fun `split should cover whole file with contiguous segments`() {
+        // When
+        val segments = DownloadState.split(10_000_003L, 4, 1024L)
+
+        // Then
+        assertEquals(4, segments.size)
+        assertEquals(0L, segments.first().start)
+        assertEquals(10_000_002L, segments.last().end)
+        segments.zipWithNext().forEach { (previous, next) ->
+            assertEquals(previous.end + 1, next.start)
+        }
+        assertEquals(10_000_003L, segments.sumOf { it.length })
+    }
+
+    @Test
+    fun `split should not create segments smaller than minimum size`() {
+        // When
+        val small = DownloadState.split(1500L, 8, 1024L)
+        val medium = DownloadState.split(3000L, 8, 1024L)
+
+        // Then
+        assertEquals(1, small.size)
+        assertEquals(2, medium.size)
+    }
+
+    @Test
+    fun `split should return empty list for empty file`() {
+        assertTrue(DownloadState.split(0L, 4, 1024L).isEmpty())
+    }
+
+    @Test
+    fun `decode should restore encoded state`() {
+        // Given
+        val state = DownloadState.create("https://cdn.example.com/a.apk", 4096L, "\"etag-1\"", 2, 1024L)
+        state.segments[0].advance(100L)
+        state.segments[1].advance(2048L)
+
+        // When
+        val decoded = DownloadState.decode(state.encode())
+
+        // Then
+        assertNotNull(decoded)
+        decoded!!
+        assertTrue(decoded.matches("https://cdn.example.com/a.apk", 4096L, "\"etag-1\""))
+        assertEquals(2148L, decoded.downloadedBytes)
+        assertEquals(100L, decoded.segments[0].nextOffset)
+        assertEquals(4096L, decoded.segments[1].nextOffset)
+        assertFalse(decoded.segments[0].isComplete)
+        assertTrue(decoded.segments[1].isComplete)
+        assertFalse(decoded.isComplete)
+    }
+
+    @Test
+    fun `decode should reject malformed or inconsistent state`() {
+        val header = "atlas-download-state 1\nurl=https://cdn.example.com/a.apk\ntotal=4096\nvalidator=\n"
+
+        assertNull(DownloadState.decode(""))
+        assertNull(DownloadState.decode("url=https://cdn.example.com/a.apk"))
+        // 分段不连续
+        assertNull(DownloadState.decode(header + "segment=0,1023,0\nsegment=2048,4095,0\n"))
+        // 分段未覆盖整个文件
+        assertNull(DownloadState.decode(header + "segment=0,1023,0\n"))
+        // 已下载字节数超过分段长度
+        assertNull(DownloadState.decode(header + "segment=0,4095,5000\n"))
+        assertNotNull(DownloadState.decode(header + "segment=0,4095,5\n"))
+    }
+
+    @Test
+    fun `parseContentRange should parse total size`() {
+        // When
+        val range = DownloadState.parseContentRange("bytes 0-0/12345")
+
+        // Then
+        assertEquals(ContentRange(0L, 0L, 12345L), range)
+    }
+
+    @Test
+    fun `parseContentRange should reject unknown total or invalid range`() {
+        assertNull(DownloadState.parseContentRange(null))
+        assertNull(DownloadState.parseContentRange("bytes 0-99/*"))
+        assertNull(DownloadState.parseContentRange("bytes 100-99/200"))
+        assertNull(DownloadState.parseContentRange("bytes */200"))
+    }
+}
@@ -2,6 +2,8 @@ package com.sword.atlas.core.network.security
 
 import org.junit.Assert.*
 import org.junit.Test
+import java.io.File
+import java.io.IOException
 
 /**
  * CryptoUtil单元测试
@@ -83,6 +85,27 @@ class CryptoUtilTest {
         assertNotEquals(hash1, hash2)
     }
     
+    @Test
+    fun `sha256 of file should match sha256 of its content`() {
+        // Given
+        val file = File.createTempFile("crypto", ".bin")
+        file.writeText("abc")
+        
+        // When
+        val hash = CryptoUtil.sha256(file)
+        file.delete()
+        
+        // Then
+        assertEquals("ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad", hash)
+        assertEquals(CryptoUtil.sha256("abc"), hash)
+    }
+    
+    @Test(expected = IOException::class)
+    fun `sha256 of missing file should throw IOException`() {
+        // When
+        CryptoUtil.sha256(File("/nonexistent/atlas-crypto-test"))
+    }
+    
     @Test
     fun `generateRandomString should generate string of correct length`() {
         // Given
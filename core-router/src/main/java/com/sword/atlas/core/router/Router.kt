@@ -6,6 +6,7 @@ import android.content.Intent
 import com.sword.atlas.core.common.util.LogUtil
 import com.sword.atlas.core.router.exception.RouteException
 import com.sword.atlas.core.router.interceptor.InterceptorManager
+import com.sword.atlas.core.router.util.RouteTimingLogger
 import javax.inject.Inject
 import javax.inject.Singleton
 
@@ -126,6 +127,12 @@ class Router @Inject constructor(
             // 1. 执行拦截器链
             if (!interceptorManager.intercept(request)) {
                 LogUtil.d("Router", "Navigation intercepted for path: ${request.path}")
+                RouteTimingLogger.log(
+                    request.path,
+                    RouteTimingLogger.RESULT_INTERCEPTED,
+                    startTime,
+                    System.currentTimeMillis() - startTime
+                )
                 request.callback?.onCancel(request.path)
                 return false
             }
@@ -143,6 +150,7 @@ class Router @Inject constructor(
             // 5. 记录导航耗时
             val duration = System.currentTimeMillis() - startTime
             LogUtil.d("Router", "Navigation completed for '${request.path}' in ${duration}ms")
+            RouteTimingLogger.log(request.path, RouteTimingLogger.RESULT_SUCCESS, startTime, duration)
             
             // 6. 执行成功回调
             request.callback?.onSuccess(request.path)
@@ -152,6 +160,7 @@ class Router @Inject constructor(
         } catch (e: Exception) {
             val duration = System.currentTimeMillis() - startTime
             LogUtil.e("Navigation failed for '${request.path}' after ${duration}ms", e, "Router")
+            RouteTimingLogger.log(request.path, RouteTimingLogger.RESULT_ERROR, startTime, duration)
             
             // 执行错误回调
             request.callback?.onError(e)
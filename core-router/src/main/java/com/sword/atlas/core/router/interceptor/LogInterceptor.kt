@@ -3,6 +3,8 @@ package com.sword.atlas.core.router.interceptor
 import android.os.Bundle
 import com.sword.atlas.core.common.util.LogUtil
 import com.sword.atlas.core.router.RouteRequest
+import java.util.Collections
+import java.util.WeakHashMap
 import javax.inject.Inject
 import javax.inject.Singleton
 
@@ -54,11 +56,14 @@ class LogInterceptor @Inject constructor() : RouteInterceptor {
     )
     
     /**
-     * 路由开始时间记录键
+     * 路由开始时间记录
+     * 不写入request.bundle，避免内部字段随Intent传递给目标页面；
+     * 使用弱引用键，未调用logRouteComplete的请求也不会造成泄漏
      */
+    private val routeStartTimes: MutableMap<RouteRequest, Long> =
+        Collections.synchronizedMap(WeakHashMap())
+    
     private companion object {
-        const val KEY_ROUTE_START_TIME = "_route_start_time"
-        const val KEY_INTERCEPTOR_START_TIME = "_interceptor_start_time"
         const val LOG_TAG = "RouterLog"
     }
     
@@ -135,8 +140,7 @@ class LogInterceptor @Inject constructor() : RouteInterceptor {
         
         try {
             // 记录拦截器开始时间
-            // TODO: 在RouteRequest完全实现后，使用bundle记录时间
-            // request.bundle.putLong(KEY_INTERCEPTOR_START_TIME, startTime)
+            routeStartTimes[request] = startTime
             
             // 记录路由开始信息
             logRouteStart(request, startTime)
@@ -313,10 +317,8 @@ class LogInterceptor @Inject constructor() : RouteInterceptor {
     fun logRouteComplete(request: RouteRequest, success: Boolean, error: Throwable? = null) {
         try {
             val currentTime = System.currentTimeMillis()
-            
-            // TODO: 在RouteRequest完全实现后，计算实际耗时
-            // val startTime = request.bundle.getLong(KEY_INTERCEPTOR_START_TIME, currentTime)
-            // val duration = currentTime - startTime
+            val startTime = routeStartTimes.remove(request)
+            val duration = startTime?.let { currentTime - it }
             
             val message = buildString {
                 if (success) {
@@ -327,7 +329,9 @@ class LogInterceptor @Inject constructor() : RouteInterceptor {
                 append("\n├─ Path: ${request.path}")
                 if (logPerformance) {
                     append("\n├─ End time: ${formatTimestamp(currentTime)}")
-                    // append("\n├─ Duration: ${duration}ms")
+                    if (duration != null) {
+                        append("\n├─ Duration: ${duration}ms")
+                    }
                 }
                 if (error != null) {
                     append("\n└─ Error: ${error.message}")
@@ -0,0 +1,65 @@
+package com.sword.atlas.core.router.util
+
+import com.sword.atlas.core.common.util.LogUtil
+
+/**
+ * 路由耗时记录器
+ * 以结构化的 key=value 格式输出路由导航耗时，便于 scripts/latency_report.py 解析统计
+ *
+ * 记录格式：
+ * ```
+ * ts=1729328400123 kind=route path=/user/profile result=success duration_ms=42
+ * ```
+ *
+ * @author Kiro
+ * @since 1.0.0
+ */
+object RouteTimingLogger {
+
+    /**
+     * 耗时记录的日志标签
+     */
+    const val TAG = "RouteTiming"
+
+    /**
+     * 导航成功
+     */
+    const val RESULT_SUCCESS = "success"
+
+    /**
+     * 导航被拦截器拦截
+     */
+    const val RESULT_INTERCEPTED = "intercepted"
+
+    /**
+     * 导航失败
+     */
+    const val RESULT_ERROR = "error"
+
+    /**
+     * 格式化耗时记录
+     *
+     * @param path 路由路径
+     * @param result 导航结果
+     * @param startTime 导航开始时间戳（毫秒）
+     * @param durationMs 导航耗时（毫秒）
+     * @return 结构化的耗时记录
+     */
+    @JvmStatic
+    fun format(path: String, result: String, startTime: Long, durationMs: Long): String {
+        return "ts=$startTime kind=route path=$path result=$result duration_ms=$durationMs"
+    }
+
+    /**
+     * 输出耗时记录
+     *
+     * @param path 路由路径
+     * @param result 导航结果
+     * @param startTime 导航开始时间戳（毫秒）
+     * @param durationMs 导航耗时（毫秒）
+     */
+    @JvmStatic
+    fun log(path: String, result: String, startTime: Long, durationMs: Long) {
+        LogUtil.i(format(path, result, startTime, durationMs), TAG)
+    }
+}
@@ -0,0 +1,49 @@
+package com.sword.atlas.core.router.util
+
+import org.junit.Assert.*
+import org.junit.Test
+
+/**
+ * RouteTimingLogger类单元测试
+ * 测试路由耗时记录格式
+ */
+class RouteTimingLoggerTest {
+
+    @Test
+    fun `test format produces key value record`() {
+        // When
+        val record = RouteTimingLogger.format(
+            "/user/profile",
+            RouteTimingLogger.RESULT_SUCCESS,
+            1729328400123L,
+            42L
+        )
+
+        // Then
+        assertEquals(
+            "ts=1729328400123 kind=route path=/user/profile result=success duration_ms=42",
+            record
+        )
+    }
+
+    @Test
+    fun `test format keeps every field parseable`() {
+        // When
+        val record = RouteTimingLogger.format(
+            "/login",
+            RouteTimingLogger.RESULT_INTERCEPTED,
+            0L,
+            7L
+        )
+        val fields = record.split(" ").associate { token ->
+            val (key, value) = token.split("=", limit = 2)
+            key to value
+        }
+
+        // Then
+        assertEquals("route", fields["kind"])
+        assertEquals("/login", fields["path"])
+        assertEquals("intercepted", fields["result"])
+        assertEquals("7", fields["duration_ms"])
+    }
+}
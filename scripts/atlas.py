@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 统一命令行入口
+使用方法: python scripts/atlas.py <command> [args...]
+打包为单文件: python scripts/build_zipapp.py
+"""
+
+from atlas_cli.cli import main
+
+
+if __name__ == "__main__":
+    main()
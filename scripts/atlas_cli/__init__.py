@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 命令行工具包
+子命令实现按需导入，保证 atlas --help 等命令快速启动
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+"""支持 python -m atlas_cli 方式运行"""
+
+from atlas_cli.cli import main
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 统一命令行入口
+使用方法: atlas <command> [args...]
+
+顶层只做命令分发，不导入 argparse 或任何子命令模块；
+子命令模块在真正执行时才导入，atlas --help 只需解释器启动的时间。
+有守护进程 (atlas daemon start) 时，支持的子命令交由守护进程执行。
+"""
+
+import os
+import sys
+import importlib
+
+
+# 命令名 -> (实现模块, 说明)
+COMMANDS = {
+    "new": ("create_module", "一键创建功能模块 (结构 + 数据层 + UI 层)"),
+    "gen-module": ("create_feature_module", "创建模块目录结构和 build.gradle.kts"),
+    "gen-data": ("create_module_files", "生成数据层文件 (API、Model、Repository)"),
+    "gen-ui": ("create_ui_files", "生成 UI 层文件 (ViewModel、Activity、布局、测试)"),
+    "gen-db": ("create_room_files", "根据模型描述生成 Room 实体、DAO、迁移与注册代码"),
+    "validate": ("validate_module", "离线校验模块 (包名、import、ViewBinding、资源、settings)"),
+    "latency": ("latency_report", "统计 logcat 中的网络请求与路由导航延迟"),
+    "download-stub": ("download_stub_server", "本地下载桩服务器与断点续传吞吐基准"),
+    "info": ("atlas_cli.info", "输出模块、命名空间与路由概览"),
+    "daemon": ("atlas_cli.daemon", "管理常驻守护进程 (start / status / stop)"),
+}
+
+# 可以交给守护进程执行的子命令 (不读取标准输入、输出可以整体返回)；
+# 其余命令不导入守护进程客户端，省去 socket 等模块的导入时间
+DAEMON_COMMANDS = {"new", "gen-module", "gen-data", "gen-ui", "gen-db", "validate", "info"}
+
+NO_DAEMON_ENV = "ATLAS_NO_DAEMON"
+
+
+def print_help(out=sys.stdout):
+    """输出顶层帮助"""
+    width = max(len(name) for name in COMMANDS)
+    lines = [
+        "usage: atlas <command> [args...]",
+        "",
+        "Atlas Framework 命令行工具",
+        "",
+        "commands:",
+    ]
+    lines.extend(f"  {name:<{width}}  {description}" for name, (_, description) in COMMANDS.items())
+    lines.extend([
+        "",
+        "使用 atlas <command> --help 查看子命令参数",
+        "可在项目任意子目录运行，或通过环境变量 ATLAS_ROOT 指定项目根目录",
+        "守护进程运行时命令交由其执行，设置 ATLAS_NO_DAEMON=1 可强制在本进程内执行",
+    ])
+    out.write("\n".join(lines) + "\n")
+
+
+def load_command(name):
+    """按需导入子命令实现模块"""
+    return importlib.import_module(COMMANDS[name][0])
+
+
+def run_command(name, args):
+    """执行子命令，返回退出码 (项目根目录由子命令自行定位)"""
+    # argparse 使用 sys.argv[0] 作为 prog，让子命令帮助显示为 "atlas <command>"
+    saved_argv = sys.argv
+    sys.argv = [f"atlas {name}"] + list(args)
+    try:
+        load_command(name).main(list(args))
+    except SystemExit as e:
+        code = e.code
+        if code is None:
+            return 0
+        if isinstance(code, int):
+            return code
+        print(code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+
+    if not args or args[0] in ("-h", "--help", "help"):
+        print_help()
+        sys.exit(0 if args else 2)
+
+    if args[0] == "--version":
+        from atlas_cli import __version__
+        print(f"atlas {__version__}")
+        sys.exit(0)
+
+    name = args[0]
+    if name not in COMMANDS:
+        print(f"错误: 未知命令 '{name}'", file=sys.stderr)
+        print_help(sys.stderr)
+        sys.exit(2)
+
+    exit_code = None
+    if name in DAEMON_COMMANDS and not os.environ.get(NO_DAEMON_ENV):
+        from atlas_cli.daemon import run_via_daemon
+        exit_code = run_via_daemon(name, args[1:])
+    if exit_code is None:
+        exit_code = run_command(name, args[1:])
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
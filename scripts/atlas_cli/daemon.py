@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 常驻守护进程
+使用方法:
+    atlas daemon start [--foreground] [--poll-interval 0.5] [--idle-timeout 1800]
+    atlas daemon status
+    atlas daemon stop
+
+守护进程常驻内存，保存项目模型 (目录列表与文件解析结果，见 atlas_cli.model) 并
+保持各子命令模块 (含其中的代码模板) 已导入。每次执行命令前先刷新模型 (对已缓存的
+目录和文件各做一次 stat)，只让发生变化的目录和文件失效；后台轮询提前完成刷新并检查
+空闲超时。子命令通过 project_tree() 读取项目时直接使用内存中的模型，validate
+在项目未变化时复用上一次的索引。IDE 模板、pre-commit 钩子连续调用 atlas 时，
+省去解释器启动、模块导入和磁盘扫描。
+
+客户端通过项目内的 Unix socket (.atlas/daemon.sock) 通信，每个连接一行 JSON 请求、
+一行 JSON 响应:
+    {"op": "ping"}                                     -> {"ok": true, "pid": ..., "root": ..., "generation": ..., "fingerprint": ...}
+    {"op": "model"}                                    -> {"ok": true, "model": {...}}
+    {"op": "run", "argv": ["validate"], "cwd": "...",
+     "fingerprint": "..."}                             -> {"ok": true, "exit_code": 0, "stdout": "...", "stderr": "..."}
+    {"op": "stop"}                                     -> {"ok": true}
+没有守护进程、无法连接或脚本版本指纹不一致时，atlas 自动在当前进程内执行命令。
+请求发出后守护进程在 REQUEST_TIMEOUT 内没有响应时，只有只读命令 (READ_ONLY_COMMANDS)
+改为在当前进程内执行；生成命令可能仍在守护进程中执行，重复执行会重复创建文件，
+因此报错退出。脚本被修改后，旧的守护进程在下一次轮询时自行退出。
+"""
+
+import os
+import sys
+import json
+import socket
+
+from atlas_cli.cli import DAEMON_COMMANDS, NO_DAEMON_ENV
+
+
+SOCKET_NAME = os.path.join(".atlas", "daemon.sock")
+LOG_NAME = os.path.join(".atlas", "daemon.log")
+
+# Unix socket 路径长度上限 (Linux 为 108 字节，macOS 为 104 字节)
+MAX_SOCKET_PATH = 100
+
+# 等待守护进程执行命令的最长时间 (秒)
+REQUEST_TIMEOUT = 10
+
+# 只读的子命令，守护进程未响应时可以安全地在当前进程内重新执行
+READ_ONLY_COMMANDS = {"validate", "info"}
+
+# 启动时预先导入的子命令模块
+WARM_MODULES = (
+    "create_module", "create_feature_module", "create_module_files",
+    "create_ui_files", "create_room_files", "validate_module", "atlas_cli.info",
+)
+
+
+def is_supported():
+    """当前平台是否支持 Unix socket"""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path(root):
+    """项目对应的 socket 路径，路径过长时改用临时目录"""
+    path = os.path.join(root, SOCKET_NAME)
+    if len(path.encode("utf-8")) <= MAX_SOCKET_PATH:
+        return path
+    import hashlib
+    digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:12]
+    tmp_dir = os.environ.get("TMPDIR", "/tmp")
+    return os.path.join(tmp_dir, f"atlas-{os.getuid()}-{digest}.sock")
+
+
+def scripts_fingerprint():
+    """
+    脚本版本指纹
+
+    由 atlas_cli 所在目录 (脚本目录或 zipapp 文件) 中 .py 文件的 mtime 与大小计算，
+    脚本被修改、更新或重新打包后指纹随之变化
+    """
+    import zlib
+    import atlas_cli
+
+    base = os.path.dirname(os.path.dirname(os.path.abspath(atlas_cli.__file__)))
+    if os.path.isfile(base):
+        paths = [base]
+    else:
+        package_dir = os.path.join(base, "atlas_cli")
+        paths = [os.path.join(d, name) for d in (base, package_dir)
+                 for name in os.listdir(d) if name.endswith(".py")]
+    parts = []
+    for path in sorted(paths):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+    return f"{atlas_cli.__version__}-{zlib.crc32(chr(10).join(parts).encode('utf-8')):08x}"
+
+
+class NoResponse(Exception):
+    """请求已发出，但没有收到守护进程的响应 (命令可能已经或仍在执行)"""
+
+
+def send_request(path, payload, timeout=REQUEST_TIMEOUT):
+    """
+    发送一次请求
+
+    @return 响应字典；守护进程不存在或连接失败 (请求未发出) 时返回 None
+    @raises NoResponse 请求已发出，但超时未响应或连接中断
+    """
+    if not is_supported() or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        except OSError:
+            return None
+        try:
+            with sock.makefile("rb") as f:
+                line = f.readline()
+            response = json.loads(line) if line else None
+        except socket.timeout:
+            raise NoResponse(f"守护进程 {timeout:g} 秒内未响应")
+        except (OSError, ValueError) as e:
+            raise NoResponse(f"读取守护进程响应失败: {e}")
+        if response is None:
+            raise NoResponse("守护进程关闭了连接")
+        return response
+    finally:
+        sock.close()
+
+
+def query(path, payload, timeout):
+    """发送管理请求 (ping / stop)，没有响应时返回 None"""
+    try:
+        return send_request(path, payload, timeout)
+    except NoResponse:
+        return None
+
+
+def run_via_daemon(name, args):
+    """
+    尝试交给守护进程执行子命令
+
+    @return 退出码；没有可用的守护进程时返回 None，由调用方在本进程内执行
+    """
+    if name not in DAEMON_COMMANDS or os.environ.get(NO_DAEMON_ENV) or not is_supported():
+        return None
+    from atlas_cli.project import find_repo_root
+    root = find_repo_root()
+    if root is None:
+        return None
+    request = {"op": "run", "argv": [name] + list(args), "cwd": os.getcwd(), "fingerprint": scripts_fingerprint()}
+    try:
+        response = send_request(socket_path(root), request)
+    except NoResponse as e:
+        if name in READ_ONLY_COMMANDS:
+            print(f"警告: {e}，改为在当前进程内执行 (可运行 atlas daemon stop 停止守护进程)", file=sys.stderr)
+            return None
+        # 命令可能已经或仍在守护进程中执行，再执行一次会重复创建模块、重复升级数据库版本
+        print(f"错误: {e}，{name} 可能仍在守护进程中执行，为避免重复执行未在当前进程内重试", file=sys.stderr)
+        print("请检查项目文件的变更后再决定是否重新运行 (可运行 atlas daemon stop 停止守护进程)", file=sys.stderr)
+        return 1
+    if not response or not response.get("ok"):
+        if response and response.get("stale"):
+            print("提示: 脚本已更新，旧的守护进程已退出，可重新运行 atlas daemon start", file=sys.stderr)
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+# ---------------------------------------------------------------------------
+# 服务端
+# ---------------------------------------------------------------------------
+
+def log(message):
+    """守护进程日志 (输出到原始 stderr，后台模式下即 .atlas/daemon.log)"""
+    import time
+    sys.__stderr__.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
+    sys.__stderr__.flush()
+
+
+class Daemon:
+    """守护进程: 持有项目模型，串行处理客户端请求"""
+
+    def __init__(self, root, poll_interval, idle_timeout):
+        import time
+        import threading
+        from atlas_cli.model import load_resident_model
+
+        self.root = root
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.path = socket_path(root)
+        self.model = load_resident_model(root)
+        self.fingerprint = scripts_fingerprint()
+        # 请求处理与轮询刷新共用一把锁，保证 cwd、stdout 重定向和模型状态互不干扰
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.last_request = time.monotonic()
+        self.server = None
+
+    def handle(self, request):
+        """处理一条请求，返回响应字典"""
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "root": self.root, "generation": self.model.generation,
+                    "fingerprint": self.fingerprint}
+        if op == "model":
+            self.model.refresh()
+            return {"ok": True, "model": self.model.snapshot()}
+        if op == "stop":
+            self.stop()
+            return {"ok": True}
+        if op == "run":
+            if request.get("fingerprint") != self.fingerprint:
+                # 客户端与守护进程加载的脚本不一致，继续执行会使用旧的代码模板
+                log("scripts changed, exiting")
+                self.stop()
+                return {"ok": False, "stale": True, "error": "scripts changed since daemon start"}
+            return self.run(request.get("argv") or [], request.get("cwd") or self.root)
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def run(self, argv, cwd):
+        """在守护进程内执行子命令并收集输出"""
+        import io
+        from contextlib import redirect_stdout, redirect_stderr
+        from atlas_cli.cli import run_command
+
+        if not argv or argv[0] not in DAEMON_COMMANDS:
+            return {"ok": False, "error": "command not supported by daemon"}
+        # 不等待轮询: 刚保存的修改必须在本次命令中可见
+        self.model.refresh()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        try:
+            os.chdir(cwd)
+        except OSError:
+            return {"ok": False, "error": f"invalid cwd: {cwd}"}
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                exit_code = run_command(argv[0], argv[1:])
+        except Exception as e:  # 子命令异常不能拖垮守护进程
+            import traceback
+            stderr.write(traceback.format_exc())
+            log(f"command {argv!r} failed: {e}")
+            exit_code = 1
+        finally:
+            os.chdir(self.root)
+        # 生成命令可能修改了项目结构，立即刷新而不等下一次轮询
+        self.model.refresh()
+        return {"ok": True, "exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def poll(self):
+        """后台线程: 轮询文件变化并检查空闲超时"""
+        import time
+        while not self.stopping.wait(self.poll_interval):
+            with self.lock:
+                try:
+                    if self.model.refresh():
+                        log(f"project model refreshed (generation {self.model.generation})")
+                except OSError as e:
+                    log(f"refresh failed: {e}")
+                idle = time.monotonic() - self.last_request
+            if scripts_fingerprint() != self.fingerprint:
+                log("scripts changed, exiting")
+                self.stop()
+            elif self.idle_timeout and idle > self.idle_timeout:
+                log(f"idle for {int(idle)}s, exiting")
+                self.stop()
+
+    def stop(self):
+        """停止服务 (serve_forever 所在线程之外调用 shutdown)"""
+        import threading
+        if self.stopping.is_set():
+            return
+        self.stopping.set()
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def serve(self):
+        import time
+        import threading
+        import importlib
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "invalid json"}
+                else:
+                    with daemon.lock:
+                        daemon.last_request = time.monotonic()
+                        response = daemon.handle(request)
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        for module_name in WARM_MODULES:
+            importlib.import_module(module_name)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        os.chdir(self.root)
+        self.server = socketserver.UnixStreamServer(self.path, Handler)
+        threading.Thread(target=self.poll, daemon=True).start()
+        log(f"listening on {self.path} (pid {os.getpid()}, root {self.root})")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            log("stopped")
+
+
+# ---------------------------------------------------------------------------
+# atlas daemon 子命令
+# ---------------------------------------------------------------------------
+
+def start_background(root, args):
+    """以独立进程启动守护进程，并等待其就绪"""
+    import time
+    import subprocess
+    import atlas_cli
+
+    # atlas_cli 包所在目录 (脚本目录或 zipapp 文件)，子进程通过 PYTHONPATH 导入
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(atlas_cli.__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_parent, env.get("PYTHONPATH")]))
+    env["ATLAS_ROOT"] = root
+    command = [
+        sys.executable, "-c", "from atlas_cli.cli import main; main()",
+        "daemon", "start", "--foreground",
+        "--poll-interval", str(args.poll_interval),
+        "--idle-timeout", str(args.idle_timeout),
+    ]
+    log_path = os.path.join(root, LOG_NAME)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        subprocess.Popen(command, cwd=root, env=env, stdin=subprocess.DEVNULL,
+                         stdout=log_file, stderr=log_file, start_new_session=True)
+
+    path = socket_path(root)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        response = query(path, {"op": "ping"}, timeout=1)
+        if response:
+            print(f"守护进程已启动 (pid {response['pid']})")
+            return
+        time.sleep(0.05)
+    print(f"错误: 守护进程启动超时，请查看 {log_path}")
+    sys.exit(1)
+
+
+def stop_stale(path, running):
+    """停止加载了旧版本脚本的守护进程，并等待其删除 socket (避免误删新进程的 socket)"""
+    import time
+    query(path, {"op": "stop"}, timeout=5)
+    deadline = time.monotonic() + 5
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    print(f"脚本已更新，已停止旧的守护进程 (pid {running['pid']})")
+
+
+def main(argv=None):
+    import argparse
+    from atlas_cli.project import enter_repo_root
+
+    parser = argparse.ArgumentParser(description="管理 atlas 常驻守护进程")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    start_parser = subparsers.add_parser("start", help="启动守护进程")
+    start_parser.add_argument("--foreground", action="store_true", help="在前台运行")
+    start_parser.add_argument("--poll-interval", type=float, default=0.5,
+                              help="文件变化轮询间隔，单位秒 (默认 0.5)")
+    start_parser.add_argument("--idle-timeout", type=float, default=1800,
+                              help="空闲多久后自动退出，单位秒，0 表示不退出 (默认 1800)")
+    subparsers.add_parser("status", help="查看守护进程状态")
+    subparsers.add_parser("stop", help="停止守护进程")
+
+    args = parser.parse_args(argv)
+
+    if not is_supported():
+        print("错误: 当前平台不支持 Unix socket，atlas 将始终在进程内执行命令")
+        sys.exit(1)
+
+    root = enter_repo_root()
+    path = socket_path(root)
+    running = query(path, {"op": "ping"}, timeout=1)
+    stale = running is not None and running.get("fingerprint") != scripts_fingerprint()
+
+    if args.action == "status":
+        if running:
+            print(f"守护进程运行中 (pid {running['pid']}，模型版本 {running['generation']})")
+            print(f"socket: {path}")
+            if stale:
+                print("脚本已在守护进程启动后更新，请重新运行 atlas daemon start")
+        else:
+            print("守护进程未运行")
+            sys.exit(1)
+    elif args.action == "stop":
+        if running:
+            query(path, {"op": "stop"}, timeout=5)
+            print(f"守护进程已停止 (pid {running['pid']})")
+        else:
+            print("守护进程未运行")
+    elif running and not stale:
+        print(f"守护进程已在运行 (pid {running['pid']})")
+    else:
+        if running:
+            stop_stale(path, running)
+        if args.foreground:
+            Daemon(root, args.poll_interval, args.idle_timeout).serve()
+        else:
+            start_background(root, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 项目概览
+使用方法: atlas info [--json]
+
+输出模块、命名空间、settings.gradle.kts 的 include 状态以及 @Route 路由表，
+并提示未 include 的模块和重复的路由路径。
+"""
+
+import sys
+import json
+import argparse
+
+from atlas_cli.model import project_tree
+from atlas_cli.project import enter_repo_root
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="输出 Atlas 项目的模块与路由概览")
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出")
+
+    args = parser.parse_args(argv)
+    root = enter_repo_root()
+    snapshot = project_tree(root).snapshot()
+
+    if args.json:
+        print(json.dumps(snapshot, ensure_ascii=False, indent=2))
+        return
+
+    includes = set(snapshot["includes"])
+    print("模块:")
+    for name, namespace in snapshot["modules"].items():
+        mark = "" if name in includes else "  (未在 settings.gradle.kts 中 include)"
+        print(f"  {name:<20} {namespace or '-'}{mark}")
+    for name in sorted(includes - set(snapshot["modules"])):
+        print(f"  {name:<20} (已 include 但目录不存在)")
+
+    print("")
+    print("路由:")
+    duplicated = 0
+    for path, targets in snapshot["routes"].items():
+        for module, class_name in targets:
+            print(f"  {path:<24} {class_name}  [{module}]")
+        if len(targets) > 1:
+            duplicated += 1
+            print(f"  ^ 警告: 路由 {path} 被 {len(targets)} 个类重复声明")
+
+    if duplicated:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
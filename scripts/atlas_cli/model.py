@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 项目模型
+项目文件的读取层，以及模块、命名空间、路由、settings.gradle.kts include 的概览
+
+脚本通过 project_tree(root) 读取项目文件，路径均相对于项目根目录:
+- 普通进程中返回 DiskTree，每次直接访问磁盘
+- atlas daemon 中返回常驻的 ProjectModel，目录列表和文件解析结果保存在内存中，
+  处理请求时不访问磁盘；守护进程轮询 refresh()，只丢弃 mtime 发生变化的目录和
+  (mtime, size) 发生变化的文件，下次访问时重新读取
+"""
+
+import os
+import re
+
+
+PACKAGE_RE = re.compile(r"^package\s+([\w.]+)", re.MULTILINE)
+GRADLE_NAMESPACE_RE = re.compile(r'namespace\s*=\s*"([\w.]+)"')
+SETTINGS_INCLUDE_RE = re.compile(r"include\(([^)]*)\)")
+ROUTE_RE = re.compile(r'^[ \t]*@Route\(\s*(?:path\s*=\s*)?"([^"]*)"', re.MULTILINE)
+CLASS_RE = re.compile(r"\bclass\s+(\w+)")
+
+SETTINGS_FILE = "settings.gradle.kts"
+
+
+def line_of(text, pos):
+    """返回字符偏移量所在的行号 (从 1 开始)"""
+    return text.count("\n", 0, pos) + 1
+
+
+def parse_settings_includes(text):
+    """解析 settings.gradle.kts 中 include 的模块 (返回 模块名 -> 行号)"""
+    includes = {}
+    for m in SETTINGS_INCLUDE_RE.finditer(text):
+        for name in re.findall(r'"(:[\w\-:]+)"', m.group(1)):
+            includes[name.lstrip(":").replace(":", "/")] = line_of(text, m.start())
+    return includes
+
+
+def parse_namespace(text):
+    """解析 build.gradle.kts 中的 namespace"""
+    match = GRADLE_NAMESPACE_RE.search(text)
+    return match.group(1) if match else ""
+
+
+def parse_routes(text):
+    """解析 Kotlin 源文件中 @Route 标注的 Activity，返回 [(路径, 类全名)]"""
+    package_match = PACKAGE_RE.search(text)
+    package = package_match.group(1) + "." if package_match else ""
+    routes = []
+    for m in ROUTE_RE.finditer(text):
+        class_match = CLASS_RE.search(text, m.end())
+        if class_match:
+            routes.append((m.group(1), package + class_match.group(1)))
+    return routes
+
+
+def _text(text):
+    """原样返回文件内容 (供 read_text 使用的解析器)"""
+    return text
+
+
+def _stat_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _scan_dir(path):
+    """列出目录，返回排序后的 (子目录名, 文件名)；目录不存在时返回空列表"""
+    subdirs, files = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                (subdirs if entry.is_dir() else files).append(entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    subdirs.sort()
+    files.sort()
+    return subdirs, files
+
+
+class FileTree:
+    """项目文件的只读视图，路径均相对于项目根目录"""
+
+    root = "."
+    generation = 0
+
+    def path(self, rel):
+        return os.path.join(self.root, rel)
+
+    def scan(self, rel):
+        raise NotImplementedError
+
+    def parse(self, rel, parser, *args):
+        raise NotImplementedError
+
+    def read_text(self, rel):
+        return self.parse(rel, _text)
+
+    def exists(self, rel):
+        parent, name = os.path.split(os.path.normpath(rel))
+        if name in ("", "."):
+            return True
+        subdirs, files = self.scan(parent or ".")
+        return name in subdirs or name in files
+
+    def isdir(self, rel):
+        parent, name = os.path.split(os.path.normpath(rel))
+        if name in ("", "."):
+            return True
+        return name in self.scan(parent or ".")[0]
+
+    def invalidate(self, rel):
+        """通知文件树 rel 已被当前进程修改"""
+
+    def walk(self, top, suffixes):
+        """遍历目录下指定后缀的文件，跳过 build 输出目录和隐藏目录"""
+        pending = [top]
+        while pending:
+            current = pending.pop()
+            subdirs, files = self.scan(current)
+            for name in files:
+                if name.endswith(suffixes):
+                    yield os.path.join(current, name)
+            pending.extend(os.path.join(current, d) for d in reversed(subdirs)
+                           if d != "build" and not d.startswith("."))
+
+    def module_dirs(self):
+        """项目根目录下包含 build.gradle(.kts) 的子目录视为模块"""
+        modules = []
+        for name in self.scan(".")[0]:
+            if name.startswith((".", "build")):
+                continue
+            if self.exists(os.path.join(name, "build.gradle.kts")) or self.exists(os.path.join(name, "build.gradle")):
+                modules.append(name)
+        return modules
+
+    def snapshot(self):
+        """可 JSON 序列化的项目概览: 模块命名空间、settings include 与 @Route 路由"""
+        includes = list(self.parse(SETTINGS_FILE, parse_settings_includes)) if self.exists(SETTINGS_FILE) else []
+        modules = {}
+        routes = {}
+        for name in self.module_dirs():
+            gradle_path = os.path.join(name, "build.gradle.kts")
+            modules[name] = self.parse(gradle_path, parse_namespace) if self.exists(gradle_path) else ""
+            for path in self.walk(os.path.join(name, "src", "main", "java"), (".kt",)):
+                for route_path, class_name in self.parse(path, parse_routes):
+                    routes.setdefault(route_path, []).append([name, class_name])
+        return {
+            "root": self.root,
+            "generation": self.generation,
+            "includes": includes,
+            "modules": modules,
+            "routes": dict(sorted(routes.items())),
+        }
+
+
+class DiskTree(FileTree):
+    """
+    直接访问磁盘的文件树
+
+    @param cache 可选的解析结果缓存，需提供 get(rel, parser, *args)
+    """
+
+    def __init__(self, root, cache=None):
+        self.root = root
+        self.cache = cache
+
+    def scan(self, rel):
+        return _scan_dir(self.path(rel))
+
+    def exists(self, rel):
+        return os.path.exists(self.path(rel))
+
+    def isdir(self, rel):
+        return os.path.isdir(self.path(rel))
+
+    def parse(self, rel, parser, *args):
+        if self.cache is not None and parser is not _text:
+            return self.cache.get(rel, parser, *args)
+        with open(self.path(rel), "r", encoding="utf-8", errors="replace") as f:
+            return parser(f.read(), *args)
+
+
+class ProjectModel(FileTree):
+    """
+    常驻内存的项目模型
+
+    只由守护进程的请求线程和轮询线程在同一把锁内访问
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.generation = 1
+        # 相对路径 -> (mtime, [子目录名], [文件名])
+        self._dirs = {}
+        # 相对路径 -> ((mtime, size), {(解析器, 参数): 解析结果})
+        self._files = {}
+        self._snapshot = None
+
+    def scan(self, rel):
+        rel = os.path.normpath(rel)
+        cached = self._dirs.get(rel)
+        if cached is None:
+            # 先取 mtime 再列目录，列目录期间的修改会在下次 refresh 时被发现
+            mtime = _stat_mtime(self.path(rel))
+            subdirs, files = _scan_dir(self.path(rel))
+            cached = self._dirs[rel] = (mtime, subdirs, files)
+        return cached[1], cached[2]
+
+    def parse(self, rel, parser, *args):
+        rel = os.path.normpath(rel)
+        entry = self._files.get(rel)
+        if entry is None:
+            entry = self._files[rel] = (_stat_key(self.path(rel)), {})
+        results = entry[1]
+        key = (parser, args)
+        if key not in results:
+            with open(self.path(rel), "r", encoding="utf-8", errors="replace") as f:
+                results[key] = parser(f.read(), *args)
+        return results[key]
+
+    def invalidate(self, rel):
+        rel = os.path.normpath(rel)
+        prefix = rel + os.sep
+        parent = os.path.dirname(rel) or "."
+        for cache in (self._dirs, self._files):
+            for path in [p for p in cache if p in (rel, parent) or p.startswith(prefix)]:
+                del cache[path]
+        self.generation += 1
+
+    def refresh(self):
+        """丢弃磁盘上已变化的目录列表和文件解析结果，返回模型是否发生变化"""
+        changed = False
+        for rel, (mtime, _, _) in list(self._dirs.items()):
+            if _stat_mtime(self.path(rel)) != mtime:
+                del self._dirs[rel]
+                changed = True
+        for rel, (key, _) in list(self._files.items()):
+            if _stat_key(self.path(rel)) != key:
+                del self._files[rel]
+                changed = True
+        if changed:
+            self.generation += 1
+        return changed
+
+    def snapshot(self):
+        if self._snapshot is None or self._snapshot["generation"] != self.generation:
+            self._snapshot = super().snapshot()
+        return self._snapshot
+
+
+_resident_models = {}
+
+
+def load_resident_model(root):
+    """创建常驻项目模型，之后本进程内的 project_tree(root) 都返回它 (仅由 atlas daemon 调用)"""
+    root = os.path.abspath(root)
+    model = _resident_models.get(root)
+    if model is None:
+        model = _resident_models[root] = ProjectModel(root)
+        model.snapshot()
+    return model
+
+
+def resident_model(root):
+    """atlas daemon 中返回常驻项目模型，普通进程中返回 None"""
+    return _resident_models.get(os.path.abspath(root))
+
+
+def project_tree(root, cache=None):
+    """
+    获取项目文件树
+
+    atlas daemon 中返回常驻项目模型，否则返回直接访问磁盘的 DiskTree
+    """
+    model = resident_model(root)
+    return model if model is not None else DiskTree(root, cache)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 脚本公共工具
+项目根目录定位与命名转换
+"""
+
+import os
+import sys
+
+
+ROOT_MARKER = "settings.gradle.kts"
+ROOT_ENV = "ATLAS_ROOT"
+
+
+def to_camel_case(snake_str):
+    """将连字符分隔的字符串转换为驼峰命名: user-profile -> UserProfile"""
+    components = snake_str.split('-')
+    return ''.join(word.capitalize() for word in components)
+
+
+def _search_upwards(start):
+    """从 start 开始向上查找包含 settings.gradle.kts 的目录"""
+    current = os.path.abspath(start)
+    while True:
+        if os.path.isfile(os.path.join(current, ROOT_MARKER)):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def find_repo_root(start=None):
+    """
+    定位 Atlas 项目根目录
+
+    依次尝试: 环境变量 ATLAS_ROOT、当前目录及其上级目录、脚本 (或 zipapp) 所在目录及其上级目录
+    """
+    env_root = os.environ.get(ROOT_ENV)
+    if env_root:
+        return os.path.abspath(env_root) if os.path.isfile(os.path.join(env_root, ROOT_MARKER)) else None
+    for candidate in (start or os.getcwd(), os.path.dirname(os.path.abspath(__file__))):
+        root = _search_upwards(candidate)
+        if root:
+            return root
+    return None
+
+
+def enter_repo_root():
+    """切换到项目根目录，找不到时退出"""
+    root = find_repo_root()
+    if root is None:
+        print(f"错误: 找不到 Atlas 项目根目录 (包含 {ROOT_MARKER} 的目录)")
+        print(f"请在项目目录内运行，或设置环境变量 {ROOT_ENV}")
+        sys.exit(1)
+    os.chdir(root)
+    return root
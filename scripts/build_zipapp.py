@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - atlas 命令行 zipapp 打包脚本
+使用方法: python scripts/build_zipapp.py [-o build/atlas.pyz]
+
+将 atlas_cli 包与各子命令脚本打包为单个可执行文件，
+可复制到任意位置运行，项目根目录由 atlas 自动定位。
+
+zipimport 无法把编译结果写回压缩包，因此打包时同时放入预编译的 .pyc，
+省去每次启动时的编译；运行时 Python 版本不一致会自动回退到源码。
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import zipapp
+import py_compile
+import tempfile
+from pathlib import PurePath
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+EXCLUDED_FILES = {"build_zipapp.py", "atlas.py"}
+
+
+def archive_filter(source_dir):
+    """只打包 Python 源码与 .pyc，跳过缓存目录和打包相关脚本"""
+    def include(path):
+        path = PurePath(path)
+        if "__pycache__" in path.parts:
+            return False
+        if os.path.isdir(os.path.join(source_dir, path)):
+            # 目录本身需要保留，zipapp 才会继续遍历
+            return True
+        if path.suffix == ".pyc":
+            return str(path)[:-1] not in EXCLUDED_FILES
+        return path.suffix == ".py" and str(path) not in EXCLUDED_FILES
+    return include
+
+
+def compile_sources(source_dir):
+    """在源码旁生成 zipimport 可直接加载的 .pyc (不校验源码时间戳)"""
+    for dirpath, _, filenames in os.walk(source_dir):
+        for filename in filenames:
+            if filename.endswith(".py"):
+                path = os.path.join(dirpath, filename)
+                py_compile.compile(
+                    path,
+                    cfile=path + "c",
+                    doraise=True,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="打包 atlas 命令行 zipapp")
+    parser.add_argument("-o", "--output", default=os.path.join("build", "atlas.pyz"),
+                        help="输出文件 (默认: build/atlas.pyz)")
+    parser.add_argument("--python", default="/usr/bin/env python3", help="shebang 解释器")
+
+    args = parser.parse_args(argv)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as staging:
+        source_dir = os.path.join(staging, "atlas")
+        shutil.copytree(SCRIPTS_DIR, source_dir, ignore=shutil.ignore_patterns("__pycache__"))
+        compile_sources(source_dir)
+        try:
+            zipapp.create_archive(
+                source_dir,
+                target=args.output,
+                interpreter=args.python,
+                main="atlas_cli.cli:main",
+                filter=archive_filter(source_dir),
+                compressed=True,
+            )
+        except zipapp.ZipAppError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+
+    print(f"已生成 {args.output} ({os.path.getsize(args.output) // 1024} KB)")
+    print(f"使用方法: {args.output} --help")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,12 @@ Atlas Framework - 功能模块创建脚本
 使用方法: python scripts/create_feature_module.py feature-modulename
 """
 
-import os
 import sys
 import argparse
 from pathlib import Path
 
-
-def to_camel_case(snake_str):
-    """将下划线分隔的字符串转换为驼峰命名"""
-    components = snake_str.split('-')
-    return ''.join(word.capitalize() for word in components)
+from atlas_cli.model import project_tree
+from atlas_cli.project import to_camel_case, enter_repo_root
 
 
 def create_directory_structure(module_dir, feature_name):
@@ -135,20 +131,22 @@ dependencies {{
         f.write(content)
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="创建 Atlas 功能模块")
     parser.add_argument("module_name", help="模块名称 (例如: feature-login)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     module_name = args.module_name
     
+    tree = project_tree(enter_repo_root())
+    
     # 检查模块名称格式
     if not module_name.startswith("feature-"):
         print("错误: 模块名称必须以 'feature-' 开头")
         sys.exit(1)
     
     # 检查模块是否已存在
-    if os.path.exists(module_name):
+    if tree.exists(module_name):
         print(f"错误: 模块 {module_name} 已存在")
         sys.exit(1)
     
@@ -163,6 +161,7 @@ def main():
     
     # 创建构建配置
     create_build_gradle(module_name, feature_name)
+    tree.invalidate(module_name)
     
     print(f"功能模块 {module_name} 创建完成！")
     print(f"下一步: python scripts/create_module_files.py {module_name}")
@@ -9,37 +9,33 @@ Atlas Framework - 一键创建功能模块脚本
 import os
 import sys
 import argparse
-import subprocess
+import importlib
+
+from atlas_cli.model import project_tree
+from atlas_cli.project import to_camel_case, enter_repo_root
 
 
 def run_script(script_name, module_name):
-    """运行指定的脚本"""
+    """在当前进程内运行指定脚本的 main()，无需重新启动解释器"""
+    module = importlib.import_module(os.path.splitext(script_name)[0])
     try:
-        result = subprocess.run([
-            sys.executable, 
-            f"scripts/{script_name}", 
-            module_name
-        ], check=True, capture_output=True, text=True)
-        
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-            
-    except subprocess.CalledProcessError as e:
-        print(f"执行 {script_name} 时出错:")
-        print(e.stdout)
-        print(e.stderr)
-        sys.exit(1)
+        module.main([module_name])
+    except SystemExit as e:
+        if e.code:
+            print(f"执行 {script_name} 时出错")
+            sys.exit(1)
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="一键创建 Atlas 功能模块")
     parser.add_argument("module_name", help="模块名称 (例如: feature-login)")
     parser.add_argument("--skip-ui", action="store_true", help="跳过UI文件生成")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     module_name = args.module_name
     
+    tree = project_tree(enter_repo_root())
+    
     print("Atlas Framework - 功能模块创建工具")
     print("=" * 50)
     
@@ -50,7 +46,7 @@ def main():
         sys.exit(1)
     
     # 检查模块是否已存在
-    if os.path.exists(module_name):
+    if tree.exists(module_name):
         print(f"错误: 模块 {module_name} 已存在")
         sys.exit(1)
     
@@ -75,16 +71,17 @@ def main():
         
         # 提取功能名称用于显示
         feature_name = module_name.replace("feature-", "")
-        feature_name_camel = ''.join(word.capitalize() for word in feature_name.split('-'))
+        feature_name_camel = to_camel_case(feature_name)
         
         print("")
         print("接下来的步骤:")
         print(f"1. 在 app/build.gradle.kts 中添加依赖:")
         print(f"   implementation(project(\":{module_name}\"))")
-        print("2. 同步项目 (Sync Project)")
-        print("3. 根据业务需求修改生成的代码")
-        print("4. 添加必要的资源文件 (图标、颜色等)")
-        print("5. 完善单元测试")
+        print(f"2. 离线校验模块: python scripts/validate_module.py {module_name}")
+        print("3. 同步项目 (Sync Project)")
+        print("4. 根据业务需求修改生成的代码")
+        print("5. 添加必要的资源文件 (图标、颜色等)")
+        print("6. 完善单元测试")
         print("")
         print("生成的文件结构:")
         print(f"├── {module_name}/")
@@ -118,6 +115,7 @@ def main():
         if os.path.exists(module_name):
             import shutil
             shutil.rmtree(module_name)
+            tree.invalidate(module_name)
             print(f"已清理创建的文件: {module_name}")
         sys.exit(1)
 
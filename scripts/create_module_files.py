@@ -6,16 +6,12 @@ Atlas Framework - 模块文件生成脚本
 使用方法: python scripts/create_module_files.py feature-modulename
 """
 
-import os
 import sys
 import argparse
 from pathlib import Path
 
-
-def to_camel_case(snake_str):
-    """将下划线分隔的字符串转换为驼峰命名"""
-    components = snake_str.split('-')
-    return ''.join(word.capitalize() for word in components)
+from atlas_cli.model import project_tree
+from atlas_cli.project import to_camel_case, enter_repo_root
 
 
 def create_manifest_and_proguard(module_dir):
@@ -140,15 +136,17 @@ class {feature_name_camel}Repository @Inject constructor(
         f.write(content)
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="生成 Atlas 功能模块文件")
     parser.add_argument("module_name", help="模块名称 (例如: feature-login)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     module_name = args.module_name
     
+    tree = project_tree(enter_repo_root())
+    
     # 检查模块是否存在
-    if not os.path.exists(module_name):
+    if not tree.exists(module_name):
         print(f"错误: 模块 {module_name} 不存在，请先运行 create_feature_module.py")
         sys.exit(1)
     
@@ -0,0 +1,952 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - Room 数据库文件生成脚本
+使用方法: python scripts/create_room_files.py model.json [--dry-run]
+          python scripts/create_room_files.py --example > article.json
+
+根据模型描述 (字段、主键、索引、查询模式) 在 core-database 中生成:
+    - entity/{Name}Entity.kt    带 @Index 的实体
+    - dao/{Name}Dao.kt          按键查询、分页查询 (LIMIT/OFFSET 与 keyset)、事务内批量写入
+    - AppDatabase.kt            注册实体与 DAO，数据库版本 +1
+    - DatabaseMigrations.kt     建表与建索引的版本迁移
+    - DatabaseModule.kt         DAO 的 Hilt Provider
+
+查询模式中用到的列 (等值条件 + 排序列) 没有被主键或已声明的索引覆盖时，自动补充复合索引，
+保证查询从第一天起就走索引而不是全表扫描。
+
+模型描述示例见 --example 输出，字段说明:
+    name         实体名称 (驼峰，例如 Article)
+    table        表名 (默认为 name 的下划线形式)
+    fields       字段列表: name / type / nullable / column / description
+                 type 可选 Long、Int、Short、Byte、Boolean、String、Double、Float、ByteArray
+    primaryKey   主键字段名，复合主键使用列表
+    autoGenerate 主键是否自增 (仅限单个 Long/Int 主键)
+    indices      额外索引: {"columns": [...], "unique": true}
+    queries      查询模式: {"type": "key" | "page" | "seek", "by": [...], "orderBy": "...",
+                 "order": "asc" | "desc", "observe": false, "replace": false, "name": "..."}
+                 key  按等值条件查询，observe 为 true 时返回 Flow，replace 为 true 时生成事务内替换方法
+                 page 基于 LIMIT/OFFSET 的分页查询及对应的计数查询
+                 seek 基于排序列的 keyset 分页 (以全部主键列打破并列)，深分页时不需要跳过前面的行
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+from atlas_cli.project import enter_repo_root
+
+
+DB_MODULE = "core-database"
+DB_PACKAGE = "com.sword.atlas.core.database"
+DB_SOURCE_DIR = f"{DB_MODULE}/src/main/java/com/sword/atlas/core/database"
+
+APP_DATABASE_PATH = f"{DB_SOURCE_DIR}/AppDatabase.kt"
+MIGRATIONS_PATH = f"{DB_SOURCE_DIR}/migration/DatabaseMigrations.kt"
+DATABASE_MODULE_PATH = f"{DB_SOURCE_DIR}/di/DatabaseModule.kt"
+
+# Kotlin 类型 -> SQLite 列类型 (与 Room 的类型映射一致)
+COLUMN_TYPES = {
+    "Long": "INTEGER",
+    "Int": "INTEGER",
+    "Short": "INTEGER",
+    "Byte": "INTEGER",
+    "Boolean": "INTEGER",
+    "String": "TEXT",
+    "Double": "REAL",
+    "Float": "REAL",
+    "ByteArray": "BLOB",
+}
+
+QUERY_TYPES = ("key", "page", "seek")
+
+ENTITY_NAME_RE = re.compile(r"^[A-Z][A-Za-z0-9]*$")
+FIELD_NAME_RE = re.compile(r"^[a-z][A-Za-z0-9]*$")
+SQL_NAME_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+
+EXAMPLE_SPEC = {
+    "name": "Article",
+    "description": "文章",
+    "table": "article",
+    "fields": [
+        {"name": "id", "type": "Long", "description": "文章ID"},
+        {"name": "authorId", "type": "Long", "description": "作者ID"},
+        {"name": "slug", "type": "String", "description": "文章短链接标识"},
+        {"name": "title", "type": "String", "description": "标题"},
+        {"name": "cover", "type": "String", "nullable": True, "description": "封面URL"},
+        {"name": "publishTime", "type": "Long", "description": "发布时间（时间戳）"},
+    ],
+    "primaryKey": "id",
+    "indices": [
+        {"columns": ["slug"], "unique": True},
+    ],
+    "queries": [
+        {"type": "key", "by": ["slug"]},
+        {"type": "key", "by": ["authorId"], "orderBy": "publishTime", "order": "desc",
+         "observe": True, "replace": True},
+        {"type": "page", "by": ["authorId"], "orderBy": "publishTime", "order": "desc"},
+        {"type": "seek", "orderBy": "publishTime", "order": "desc"},
+    ],
+}
+
+
+class SpecError(Exception):
+    """模型描述或项目现状不满足生成条件"""
+
+
+def to_snake_case(name):
+    """驼峰转下划线: publishTime -> publish_time"""
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+def quote(identifier):
+    """用反引号引用 SQL 标识符 (与 Room 生成的语句一致)，列名为 order、group 等关键字时也能解析"""
+    return f"`{identifier}`"
+
+
+def upper_first(name):
+    """首字母大写: authorId -> AuthorId"""
+    return name[:1].upper() + name[1:]
+
+
+def lower_first(name):
+    """首字母小写: Article -> article"""
+    return name[:1].lower() + name[1:]
+
+
+# ---------------------------------------------------------------------------
+# 模型描述
+# ---------------------------------------------------------------------------
+
+class Field:
+    """实体字段"""
+
+    def __init__(self, data):
+        if not isinstance(data, dict):
+            raise SpecError(f"字段定义必须是对象: {data!r}")
+        self.name = data.get("name", "")
+        self.type = data.get("type", "")
+        self.nullable = bool(data.get("nullable", False))
+        self.column = data.get("column") or to_snake_case(self.name)
+        self.description = data.get("description") or self.name
+        if not FIELD_NAME_RE.match(self.name):
+            raise SpecError(f"字段名 '{self.name}' 必须是小写字母开头的驼峰命名")
+        if self.type not in COLUMN_TYPES:
+            raise SpecError(f"字段 {self.name} 的类型 '{self.type}' 不受支持，可选: {', '.join(COLUMN_TYPES)}")
+        if not SQL_NAME_RE.match(self.column):
+            raise SpecError(f"字段 {self.name} 的列名 '{self.column}' 必须由小写字母、数字和下划线组成")
+
+    @property
+    def kotlin_type(self):
+        return self.type + ("?" if self.nullable else "")
+
+    @property
+    def sql_type(self):
+        return COLUMN_TYPES[self.type]
+
+
+class Query:
+    """查询模式"""
+
+    def __init__(self, data, fields):
+        if not isinstance(data, dict):
+            raise SpecError(f"查询定义必须是对象: {data!r}")
+        self.type = data.get("type", "key")
+        by = data.get("by") or []
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.order_by = data.get("orderBy")
+        self.descending = str(data.get("order", "asc")).lower() == "desc"
+        self.observe = bool(data.get("observe", False))
+        self.replace = bool(data.get("replace", False))
+        self.name = data.get("name")
+
+        if self.type not in QUERY_TYPES:
+            raise SpecError(f"查询类型 '{self.type}' 不受支持，可选: {', '.join(QUERY_TYPES)}")
+        for name in self.by + ([self.order_by] if self.order_by else []):
+            if name not in fields:
+                raise SpecError(f"查询引用了不存在的字段 '{name}'")
+        if len(set(self.by)) != len(self.by):
+            raise SpecError(f"查询条件中存在重复字段: {self.by}")
+        if self.order_by in self.by:
+            raise SpecError(f"排序字段 {self.order_by} 已是等值条件，排序没有意义")
+        if self.type == "seek":
+            if not self.order_by:
+                raise SpecError("seek 查询必须指定 orderBy")
+            if fields[self.order_by].nullable:
+                raise SpecError(f"seek 查询的排序字段 {self.order_by} 不能为可空类型")
+        if self.replace and (self.type != "key" or not self.by):
+            raise SpecError("replace 仅适用于带等值条件的 key 查询")
+        if self.observe and self.type != "key":
+            raise SpecError("observe 仅适用于 key 查询")
+
+    @property
+    def by_suffix(self):
+        return "By" + "And".join(upper_first(name) for name in self.by) if self.by else ""
+
+
+class Index:
+    """索引 (字段名列表)"""
+
+    def __init__(self, columns, unique=False, derived=False):
+        self.columns = list(columns)
+        self.unique = unique
+        self.derived = derived
+
+
+class ModelSpec:
+    """校验后的模型描述"""
+
+    def __init__(self, data):
+        if not isinstance(data, dict):
+            raise SpecError("模型描述必须是 JSON 对象")
+        self.name = data.get("name", "")
+        if not ENTITY_NAME_RE.match(self.name):
+            raise SpecError(f"实体名称 '{self.name}' 必须是大写字母开头的驼峰命名")
+        self.description = data.get("description") or self.name
+        self.table = data.get("table") or to_snake_case(self.name)
+        if not SQL_NAME_RE.match(self.table):
+            raise SpecError(f"表名 '{self.table}' 必须由小写字母、数字和下划线组成")
+
+        self.fields = [Field(item) for item in data.get("fields") or []]
+        if not self.fields:
+            raise SpecError("模型描述中没有字段")
+        self.field_map = {}
+        columns = set()
+        for field in self.fields:
+            if field.name in self.field_map or field.column in columns:
+                raise SpecError(f"字段 {field.name} 重复定义")
+            self.field_map[field.name] = field
+            columns.add(field.column)
+
+        primary_key = data.get("primaryKey")
+        self.primary_key = [primary_key] if isinstance(primary_key, str) else list(primary_key or [])
+        if not self.primary_key:
+            raise SpecError("必须指定 primaryKey")
+        for name in self.primary_key:
+            if name not in self.field_map:
+                raise SpecError(f"主键字段 '{name}' 不存在")
+            if self.field_map[name].nullable:
+                raise SpecError(f"主键字段 {name} 不能为可空类型")
+        self.auto_generate = bool(data.get("autoGenerate", False))
+        if self.auto_generate and (len(self.primary_key) != 1
+                                   or self.field_map[self.primary_key[0]].type not in ("Long", "Int")):
+            raise SpecError("autoGenerate 仅适用于单个 Long/Int 主键")
+
+        self.indices = []
+        for item in data.get("indices") or []:
+            if isinstance(item, str):
+                item = {"columns": [item]}
+            elif isinstance(item, list):
+                item = {"columns": item}
+            index_columns = item.get("columns") or []
+            for name in index_columns:
+                if name not in self.field_map:
+                    raise SpecError(f"索引引用了不存在的字段 '{name}'")
+            if not index_columns:
+                raise SpecError("索引至少包含一个字段")
+            self.indices.append(Index(index_columns, bool(item.get("unique", False))))
+
+        self.queries = [Query(item, self.field_map) for item in data.get("queries") or []]
+
+    @property
+    def entity_class(self):
+        return f"{self.name}Entity"
+
+    @property
+    def dao_class(self):
+        return f"{self.name}Dao"
+
+    @property
+    def dao_getter(self):
+        return f"{lower_first(self.name)}Dao"
+
+    def column(self, name):
+        return self.field_map[name].column
+
+    @property
+    def sql_table(self):
+        return quote(self.table)
+
+    def sql_column(self, name):
+        return quote(self.column(name))
+
+
+def load_spec(path):
+    """读取并校验模型描述文件"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise SpecError(f"模型描述文件 {path} 不存在")
+    except ValueError as e:
+        raise SpecError(f"模型描述文件 {path} 不是合法的 JSON: {e}")
+    return ModelSpec(data)
+
+
+# ---------------------------------------------------------------------------
+# 索引推导
+# ---------------------------------------------------------------------------
+
+def seek_tie_breakers(spec, query):
+    """
+    keyset 分页中用来打破排序列并列的主键列
+
+    等值条件列在结果中是常量，不参与排序；排序列与等值条件已包含全部主键列时不需要
+    """
+    return [name for name in spec.primary_key if name != query.order_by and name not in query.by]
+
+
+def sort_columns(spec, query):
+    """
+    排序需要紧跟在等值条件之后的索引列
+
+    seek 查询还要按主键打破并列；单个整数主键是 rowid 的别名，已隐含在每个索引的末尾
+    """
+    if not query.order_by:
+        return []
+    columns = [query.order_by]
+    rowid_alias = len(spec.primary_key) == 1 and spec.field_map[spec.primary_key[0]].sql_type == "INTEGER"
+    if query.type == "seek" and not rowid_alias:
+        columns += seek_tie_breakers(spec, query)
+    return columns
+
+
+def covers(spec, index_columns, query):
+    """
+    索引是否能服务该查询
+
+    等值条件必须是索引的前缀 (顺序不限)，排序列 (及 seek 查询的主键列) 紧随其后时排序也能走索引
+    """
+    count = len(query.by)
+    if set(index_columns[:count]) != set(query.by):
+        return False
+    tail = sort_columns(spec, query)
+    return index_columns[count:count + len(tail)] == tail
+
+
+def derive_indices(spec):
+    """为没有被主键或已声明索引覆盖的查询补充索引，返回新增的索引"""
+    derived = []
+    required = {id(query): query.by + sort_columns(spec, query) for query in spec.queries}
+    # 列多的查询先处理，它的索引往往也能覆盖列少的查询，避免生成冗余的前缀索引
+    for query in sorted(spec.queries, key=lambda q: len(required[id(q)]), reverse=True):
+        if not required[id(query)]:
+            continue
+        candidates = [spec.primary_key] + [index.columns for index in spec.indices + derived]
+        if any(covers(spec, columns, query) for columns in candidates):
+            continue
+        derived.append(Index(required[id(query)], derived=True))
+    spec.indices.extend(derived)
+    return derived
+
+
+def index_name(spec, index):
+    """Room 默认的索引名: index_{表名}_{列名...}"""
+    return "index_" + spec.table + "_" + "_".join(spec.column(name) for name in index.columns)
+
+
+def is_unique_lookup(spec, query):
+    """等值条件是否唯一确定一行"""
+    keys = set(query.by)
+    if keys and keys == set(spec.primary_key):
+        return True
+    return any(index.unique and set(index.columns) <= keys for index in spec.indices)
+
+
+# ---------------------------------------------------------------------------
+# 实体
+# ---------------------------------------------------------------------------
+
+def create_entity(spec):
+    """生成实体源码"""
+    single_pk = len(spec.primary_key) == 1
+    imports = ["androidx.room.ColumnInfo", "androidx.room.Entity"]
+    if spec.indices:
+        imports.append("androidx.room.Index")
+    if single_pk:
+        imports.append("androidx.room.PrimaryKey")
+
+    entity_args = [f'tableName = "{spec.table}"']
+    if not single_pk:
+        keys = ", ".join(f'"{spec.column(name)}"' for name in spec.primary_key)
+        entity_args.append(f"primaryKeys = [{keys}]")
+    if spec.indices:
+        lines = []
+        for index in spec.indices:
+            columns = ", ".join(f'"{spec.column(name)}"' for name in index.columns)
+            unique = ", unique = true" if index.unique else ""
+            lines.append(f"        Index(value = [{columns}]{unique})")
+        entity_args.append("indices = [\n" + ",\n".join(lines) + "\n    ]")
+    if len(entity_args) == 1:
+        annotation = f"@Entity({entity_args[0]})"
+    else:
+        annotation = "@Entity(\n" + ",\n".join(f"    {arg}" for arg in entity_args) + "\n)"
+
+    properties = []
+    for field in spec.fields:
+        suffix = "（主键）" if field.name in spec.primary_key else ""
+        properties.append(f" * @property {field.name} {field.description}{suffix}")
+
+    params = []
+    for field in spec.fields:
+        lines = []
+        default = ""
+        if single_pk and field.name == spec.primary_key[0]:
+            if spec.auto_generate:
+                lines.append("    @PrimaryKey(autoGenerate = true)")
+                default = " = 0"
+            else:
+                lines.append("    @PrimaryKey")
+        lines.append(f'    @ColumnInfo(name = "{field.column}")')
+        lines.append(f"    val {field.name}: {field.kotlin_type}{default}")
+        params.append("\n".join(lines))
+
+    import_lines = "\n".join(f"import {name}" for name in imports)
+    property_lines = "\n".join(properties)
+    param_lines = ",\n    \n".join(params)
+    return f'''package {DB_PACKAGE}.entity
+
+{import_lines}
+
+/**
+ * {spec.description}实体
+ * 
+ * 用于本地数据库存储{spec.description}信息
+ * 
+{property_lines}
+ * @author Atlas Framework
+ */
+{annotation}
+data class {spec.entity_class}(
+{param_lines}
+)
+'''
+
+
+# ---------------------------------------------------------------------------
+# DAO
+# ---------------------------------------------------------------------------
+
+def kdoc(summary, params=(), returns=None, notes=()):
+    """生成方法 KDoc"""
+    lines = ["    /**", f"     * {summary}"]
+    if notes:
+        lines.append("     * ")
+        lines.extend(f"     * {note}" for note in notes)
+    if params or returns:
+        lines.append("     * ")
+    lines.extend(f"     * @param {name} {description}" for name, description in params)
+    if returns:
+        lines.append(f"     * @return {returns}")
+    lines.append("     */")
+    return "\n".join(lines)
+
+
+def where_clause(spec, names):
+    return " AND ".join(f"{spec.sql_column(name)} = :{name}" for name in names)
+
+
+def order_clause(spec, query, tie_breakers=()):
+    if not query.order_by:
+        return ""
+    direction = " DESC" if query.descending else ""
+    return " ORDER BY " + ", ".join(f"{spec.sql_column(name)}{direction}"
+                                    for name in [query.order_by] + list(tie_breakers))
+
+
+def seek_after(spec, names, compare):
+    """
+    (names...) 按字典序位于游标之后的条件
+
+    minSdk 24 自带的 SQLite 不支持行值比较 (a, b) > (:a, :b)，展开为逐列比较
+    """
+    column, cursor = spec.sql_column(names[0]), f":after{upper_first(names[0])}"
+    if len(names) == 1:
+        return f"{column} {compare} {cursor}"
+    return f"{column} {compare} {cursor} OR ({column} = {cursor} AND ({seek_after(spec, names[1:], compare)}))"
+
+
+def describe_keys(spec, names):
+    return "和".join(spec.field_map[name].description for name in names)
+
+
+def key_params(spec, names):
+    signature = ", ".join(f"{name}: {spec.field_map[name].type}" for name in names)
+    docs = [(name, spec.field_map[name].description) for name in names]
+    return signature, docs
+
+
+class DaoBuilder:
+    """逐个添加 DAO 方法，检查方法名冲突"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.methods = []
+        self.names = set()
+        self.uses_flow = False
+        self.uses_transaction = False
+
+    def add(self, name, text):
+        if name in self.names:
+            raise SpecError(f"DAO 方法 {name} 重复，请在查询中通过 name 指定方法名")
+        self.names.add(name)
+        self.methods.append(text)
+
+    def add_primary_key_methods(self):
+        spec = self.spec
+        keys = spec.primary_key
+        suffix = "By" + "And".join(upper_first(name) for name in keys)
+        signature, docs = key_params(spec, keys)
+        description = describe_keys(spec, keys)
+        where = where_clause(spec, keys)
+
+        self.add(f"get{suffix}", "\n".join([
+            kdoc(f"根据{description}查询{spec.description}", docs, f"{spec.description}实体，如果不存在返回null"),
+            f'    @Query("SELECT * FROM {spec.sql_table} WHERE {where}")',
+            f"    suspend fun get{suffix}({signature}): {spec.entity_class}?",
+        ]))
+        self.add(f"delete{suffix}", "\n".join([
+            kdoc(f"根据{description}删除{spec.description}", docs, "删除的行数"),
+            f'    @Query("DELETE FROM {spec.sql_table} WHERE {where}")',
+            f"    suspend fun delete{suffix}({signature}): Int",
+        ]))
+
+    def add_key_query(self, query):
+        spec = self.spec
+        signature, docs = key_params(spec, query.by)
+        where = f" WHERE {where_clause(spec, query.by)}" if query.by else ""
+        sql = f"SELECT * FROM {spec.sql_table}{where}{order_clause(spec, query)}"
+        condition = f"根据{describe_keys(spec, query.by)}" if query.by else "全部"
+        single = is_unique_lookup(spec, query)
+        if single:
+            result, returns = f"{spec.entity_class}?", f"{spec.description}实体，如果不存在返回null"
+        else:
+            result, returns = f"List<{spec.entity_class}>", f"{spec.description}列表"
+
+        if query.observe:
+            self.uses_flow = True
+            name = query.name or f"observe{query.by_suffix or 'All'}"
+            self.add(name, "\n".join([
+                kdoc(f"{condition}观察{spec.description}", docs, f"{returns}Flow"),
+                f'    @Query("{sql}")',
+                f"    fun {name}({signature}): Flow<{result}>",
+            ]))
+        else:
+            name = query.name or f"get{query.by_suffix or 'All'}"
+            self.add(name, "\n".join([
+                kdoc(f"{condition}查询{spec.description}", docs, returns),
+                f'    @Query("{sql}")',
+                f"    suspend fun {name}({signature}): {result}",
+            ]))
+
+        if query.replace:
+            self.add_replace_methods(query, signature, docs)
+
+    def add_replace_methods(self, query, signature, docs):
+        spec = self.spec
+        self.uses_transaction = True
+        description = describe_keys(spec, query.by)
+        delete_name = f"delete{query.by_suffix}"
+        replace_name = f"replace{query.by_suffix}"
+        arguments = ", ".join(query.by)
+        self.add(delete_name, "\n".join([
+            kdoc(f"根据{description}删除{spec.description}", docs, "删除的行数"),
+            f'    @Query("DELETE FROM {spec.sql_table} WHERE {where_clause(spec, query.by)}")',
+            f"    suspend fun {delete_name}({signature}): Int",
+        ]))
+        self.add(replace_name, "\n".join([
+            kdoc(f"用新数据替换指定{description}下的全部{spec.description}",
+                 docs + [("entities", f"新的{spec.description}列表")],
+                 notes=["删除和写入在同一个事务中完成，观察者不会看到中间状态"]),
+            "    @Transaction",
+            f"    suspend fun {replace_name}({signature}, entities: List<{spec.entity_class}>) {{",
+            f"        {delete_name}({arguments})",
+            "        upsertAll(entities)",
+            "    }",
+        ]))
+
+    def add_page_query(self, query):
+        spec = self.spec
+        signature, docs = key_params(spec, query.by)
+        where = f" WHERE {where_clause(spec, query.by)}" if query.by else ""
+        condition = f"根据{describe_keys(spec, query.by)}" if query.by else ""
+        name = query.name or f"getPage{query.by_suffix}"
+        page_signature = ", ".join(filter(None, [signature, "limit: Int", "offset: Int"]))
+        self.add(name, "\n".join([
+            kdoc(f"{condition}分页查询{spec.description}",
+                 docs + [("limit", "每页数量"), ("offset", "跳过的行数")],
+                 f"{spec.description}列表",
+                 notes=["页码较深时请改用 keyset 分页 (seek 查询)，OFFSET 需要逐行跳过前面的数据"]),
+            f'    @Query("SELECT * FROM {spec.sql_table}{where}{order_clause(spec, query)} LIMIT :limit OFFSET :offset")',
+            f"    suspend fun {name}({page_signature}): List<{spec.entity_class}>",
+        ]))
+
+        count_name = f"count{query.by_suffix}"
+        if count_name not in self.names:
+            self.add(count_name, "\n".join([
+                kdoc(f"{condition}统计{spec.description}数量", docs, "记录总数"),
+                f'    @Query("SELECT COUNT(*) FROM {spec.sql_table}{where}")',
+                f"    suspend fun {count_name}({signature}): Int",
+            ]))
+
+    def add_seek_query(self, query):
+        spec = self.spec
+        signature, docs = key_params(spec, query.by)
+        order_field = spec.field_map[query.order_by]
+        order_column = spec.sql_column(query.order_by)
+        cursor = f"after{upper_first(query.order_by)}"
+        compare = "<" if query.descending else ">"
+        params = [signature, f"{cursor}: {order_field.type}"]
+        docs = docs + [(cursor, f"上一页最后一条的{order_field.description}")]
+
+        # 用主键列 (复合主键时全部列) 打破排序列的并列，保证翻页不重不漏
+        tie_breakers = seek_tie_breakers(spec, query)
+        for tie_breaker in tie_breakers:
+            tie_field = spec.field_map[tie_breaker]
+            tie_cursor = f"after{upper_first(tie_breaker)}"
+            params.append(f"{tie_cursor}: {tie_field.type}")
+            docs.append((tie_cursor, f"上一页最后一条的{tie_field.description}"))
+        if tie_breakers:
+            # 先用范围条件限定排序列，索引可以直接定位到起点而不是从头扫描
+            seek = (f"{order_column} {compare}= :{cursor} AND ({order_column} {compare} :{cursor} "
+                    f"OR {seek_after(spec, tie_breakers, compare)})")
+        else:
+            seek = f"{order_column} {compare} :{cursor}"
+        conditions = ([where_clause(spec, query.by)] if query.by else []) + [seek]
+        params.append("limit: Int")
+        docs.append(("limit", "每页数量"))
+
+        condition = f"根据{describe_keys(spec, query.by)}" if query.by else ""
+        name = query.name or f"getPage{query.by_suffix}After"
+        sql = (f"SELECT * FROM {spec.sql_table} WHERE {' AND '.join(conditions)}"
+               f"{order_clause(spec, query, tie_breakers)} LIMIT :limit")
+        self.add(name, "\n".join([
+            kdoc(f"{condition}按{order_field.description}翻页查询{spec.description}",
+                 docs, f"{spec.description}列表",
+                 notes=["从上一页最后一条记录之后继续读取，查询代价与页码深度无关"]),
+            f'    @Query("{sql}")',
+            f"    suspend fun {name}({', '.join(filter(None, params))}): List<{spec.entity_class}>",
+        ]))
+
+    def add_table_methods(self):
+        spec = self.spec
+        self.uses_transaction = True
+        self.add("deleteAll", "\n".join([
+            kdoc(f"删除所有{spec.description}", returns="删除的行数"),
+            f'    @Query("DELETE FROM {spec.sql_table}")',
+            "    suspend fun deleteAll(): Int",
+        ]))
+        self.add("replaceAll", "\n".join([
+            kdoc(f"用新数据替换全部{spec.description}",
+                 [("entities", f"新的{spec.description}列表")],
+                 notes=["删除和写入在同一个事务中完成，适合整表刷新缓存"]),
+            "    @Transaction",
+            f"    suspend fun replaceAll(entities: List<{spec.entity_class}>) {{",
+            "        deleteAll()",
+            "        upsertAll(entities)",
+            "    }",
+        ]))
+
+
+def create_dao(spec):
+    """生成 DAO 源码"""
+    builder = DaoBuilder(spec)
+    builder.add_primary_key_methods()
+    for query in spec.queries:
+        if query.type == "key":
+            if set(query.by) == set(spec.primary_key) and not (query.observe or query.replace or query.name):
+                continue  # 与主键查询重复
+            builder.add_key_query(query)
+        elif query.type == "page":
+            builder.add_page_query(query)
+        else:
+            builder.add_seek_query(query)
+    builder.add_table_methods()
+
+    imports = ["androidx.room.Dao", "androidx.room.Query"]
+    if builder.uses_transaction:
+        imports.append("androidx.room.Transaction")
+    imports.append(f"{DB_PACKAGE}.entity.{spec.entity_class}")
+    if builder.uses_flow:
+        imports.append("kotlinx.coroutines.flow.Flow")
+
+    import_lines = "\n".join(f"import {name}" for name in imports)
+    method_lines = "\n    \n".join(builder.methods)
+    return f'''package {DB_PACKAGE}.dao
+
+{import_lines}
+
+/**
+ * {spec.description}DAO
+ * 
+ * 提供{spec.description}数据的数据库访问方法，查询用到的列均已建立索引；
+ * 单条与批量写入使用 BaseDao 的 upsert / upsertAll
+ * 
+ * @author Atlas Framework
+ */
+@Dao
+interface {spec.dao_class} : BaseDao<{spec.entity_class}> {{
+    
+{method_lines}
+}}
+'''
+
+
+# ---------------------------------------------------------------------------
+# 迁移 SQL
+# ---------------------------------------------------------------------------
+
+def create_table_sql(spec):
+    """与 Room 生成的建表语句一致"""
+    single_auto = spec.auto_generate and len(spec.primary_key) == 1
+    columns = []
+    for field in spec.fields:
+        definition = f"{quote(field.column)} {field.sql_type}"
+        if single_auto and field.name == spec.primary_key[0]:
+            definition += " PRIMARY KEY AUTOINCREMENT"
+        if not field.nullable:
+            definition += " NOT NULL"
+        columns.append(definition)
+    if not single_auto:
+        keys = ", ".join(spec.sql_column(name) for name in spec.primary_key)
+        columns.append(f"PRIMARY KEY({keys})")
+    return f"CREATE TABLE IF NOT EXISTS {spec.sql_table} ({', '.join(columns)})"
+
+
+def create_index_sql(spec, index):
+    unique = "UNIQUE " if index.unique else ""
+    columns = ", ".join(spec.sql_column(name) for name in index.columns)
+    return f"CREATE {unique}INDEX IF NOT EXISTS {quote(index_name(spec, index))} ON {spec.sql_table} ({columns})"
+
+
+def migration_body(spec, database_var="database"):
+    statements = [create_table_sql(spec)] + [create_index_sql(spec, index) for index in spec.indices]
+    return "".join(f'            {database_var}.execSQL("{sql}")\n' for sql in statements)
+
+
+# ---------------------------------------------------------------------------
+# 修改现有文件
+# ---------------------------------------------------------------------------
+
+def read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def add_imports(text, new_imports):
+    """合并 import 并按字母顺序排列"""
+    lines = text.split("\n")
+    positions = [i for i, line in enumerate(lines) if line.startswith("import ")]
+    if not positions:
+        raise SpecError("源文件中没有 import 语句，无法自动修改")
+    first, last = positions[0], positions[-1]
+    imports = set(lines[i] for i in positions) | set(f"import {name}" for name in new_imports)
+    return "\n".join(lines[:first] + sorted(imports) + lines[last + 1:])
+
+
+def find_block_end(text, open_brace):
+    """返回与 open_brace 位置的 { 匹配的 } 的位置 (跳过字符串和行注释)"""
+    depth = 0
+    i = open_brace
+    while i < len(text):
+        char = text[i]
+        if text.startswith("//", i):
+            i = text.find("\n", i)
+            if i < 0:
+                break
+        elif char == '"':
+            i = text.find('"', i + 1)
+            if i < 0:
+                break
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise SpecError("无法解析源文件中的代码块")
+
+
+def update_app_database(text, spec):
+    """注册实体与 DAO，版本号 +1，返回 (新内容, 旧版本, 新版本)"""
+    if re.search(rf"\bfun {spec.dao_getter}\(", text):
+        raise SpecError(f"AppDatabase 中已存在 {spec.dao_getter}()")
+
+    entities_match = re.search(r"entities\s*=\s*\[([^\]]*)\]", text)
+    version_match = re.search(r"\bversion\s*=\s*(\d+)", text)
+    companion = text.find("    companion object")
+    if not entities_match or not version_match or companion < 0:
+        raise SpecError("无法识别 AppDatabase 的 @Database 注解或 companion object")
+
+    old_version = int(version_match.group(1))
+    new_version = old_version + 1
+    entities = [item.strip() for item in entities_match.group(1).split(",") if item.strip()]
+    entities.append(f"{spec.entity_class}::class")
+    entities_text = "entities = [\n" + ",\n".join(f"        {item}" for item in entities) + "\n    ]"
+
+    dao_fun = (f"    /**\n"
+               f"     * 获取{spec.description}DAO\n"
+               f"     */\n"
+               f"    abstract fun {spec.dao_getter}(): {spec.dao_class}\n"
+               f"    \n")
+    text = text[:companion] + dao_fun + text[companion:]
+    text = (text[:version_match.start()] + f"version = {new_version}" + text[version_match.end():])
+    text = text[:entities_match.start()] + entities_text + text[entities_match.end():]
+    text = add_imports(text, [f"{DB_PACKAGE}.dao.{spec.dao_class}", f"{DB_PACKAGE}.entity.{spec.entity_class}"])
+    return text, old_version, new_version
+
+
+def update_migrations(text, spec, old_version, new_version):
+    """
+    添加 MIGRATION_{旧}_{新}
+
+    同名迁移已存在且只有注释 (示例占位) 时填充其内容，已有实际语句时报错
+    """
+    name = f"MIGRATION_{old_version}_{new_version}"
+    doc = (f"    /**\n"
+           f"     * 从版本{old_version}迁移到版本{new_version}\n"
+           f"     * \n"
+           f"     * 创建{spec.table}表{'及其索引' if spec.indices else ''}\n"
+           f"     */\n")
+
+    existing = re.search(rf"^    val {name} = object : Migration\({old_version}, {new_version}\) \{{", text, re.MULTILINE)
+    if existing:
+        migrate = re.compile(r"override fun migrate\((\w+): SupportSQLiteDatabase\) \{").search(text, existing.end())
+        if not migrate:
+            raise SpecError(f"无法解析 {name}")
+        body_start = migrate.end()
+        body_end = find_block_end(text, body_start - 1)
+        for line in text[body_start:body_end].splitlines():
+            if line.strip() and not line.strip().startswith("//"):
+                raise SpecError(f"{name} 已包含迁移语句，请先合并已有的数据库变更")
+        text = (text[:body_start] + "\n" + migration_body(spec, migrate.group(1)) + "        "
+                + text[body_end:])
+        doc_start = text.rfind("    /**", 0, existing.start())
+        if doc_start >= 0 and text[doc_start:existing.start()].rstrip().endswith("*/"):
+            text = text[:doc_start] + doc + text[existing.start():]
+        return text
+
+    anchor = text.find("    /**\n     * 获取所有迁移策略")
+    array_match = re.search(r"arrayOf\(([^)]*)\)", text)
+    if anchor < 0 or not array_match:
+        raise SpecError("无法识别 DatabaseMigrations.getAllMigrations()")
+    migrations = [item.strip() for item in array_match.group(1).split(",") if item.strip()]
+    migrations.append(name)
+    array_text = "arrayOf(\n" + ",\n".join(f"            {item}" for item in migrations) + "\n        )"
+    text = text[:array_match.start()] + array_text + text[array_match.end():]
+    block = (doc
+             + f"    val {name} = object : Migration({old_version}, {new_version}) {{\n"
+             + "        override fun migrate(database: SupportSQLiteDatabase) {\n"
+             + migration_body(spec)
+             + "        }\n"
+             + "    }\n"
+             + "    \n")
+    return text[:anchor] + block + text[anchor:]
+
+
+def update_database_module(text, spec):
+    """启用迁移策略并添加 DAO Provider"""
+    text = re.sub(r"// 添加迁移策略（[^）\n]*）", "// 添加迁移策略", text)
+    text = re.sub(r"^(\s*)// (\.addMigrations\(.*\))$", r"\1\2", text, flags=re.MULTILINE)
+
+    provider = (f"    \n"
+                f"    /**\n"
+                f"     * 提供{spec.dao_class}实例\n"
+                f"     * \n"
+                f"     * @param database AppDatabase实例\n"
+                f"     * @return {spec.dao_class}实例\n"
+                f"     */\n"
+                f"    @Provides\n"
+                f"    @Singleton\n"
+                f"    fun provide{spec.dao_class}(database: AppDatabase): {spec.dao_class} {{\n"
+                f"        return database.{spec.dao_getter}()\n"
+                f"    }}\n")
+    end = text.rstrip().rfind("}")
+    text = text[:end] + provider + text[end:]
+    return add_imports(text, [f"{DB_PACKAGE}.dao.{spec.dao_class}"])
+
+
+def check_conflicts(spec):
+    """生成前检查文件和表名冲突"""
+    for path in (APP_DATABASE_PATH, MIGRATIONS_PATH, DATABASE_MODULE_PATH):
+        if not os.path.exists(path):
+            raise SpecError(f"找不到 {path}")
+    for path in (f"{DB_SOURCE_DIR}/entity/{spec.entity_class}.kt", f"{DB_SOURCE_DIR}/dao/{spec.dao_class}.kt"):
+        if os.path.exists(path):
+            raise SpecError(f"{path} 已存在")
+    entity_dir = f"{DB_SOURCE_DIR}/entity"
+    for file_name in sorted(os.listdir(entity_dir)):
+        if file_name.endswith(".kt") and re.search(rf'tableName\s*=\s*"{spec.table}"',
+                                                    read_text(os.path.join(entity_dir, file_name))):
+            raise SpecError(f"表 {spec.table} 已由 {file_name} 定义")
+
+
+def generate(spec):
+    """计算所有要写入的文件，返回 ([(路径, 内容)], 旧版本, 新版本)"""
+    check_conflicts(spec)
+    database_text, old_version, new_version = update_app_database(read_text(APP_DATABASE_PATH), spec)
+    return [
+        (f"{DB_SOURCE_DIR}/entity/{spec.entity_class}.kt", create_entity(spec)),
+        (f"{DB_SOURCE_DIR}/dao/{spec.dao_class}.kt", create_dao(spec)),
+        (APP_DATABASE_PATH, database_text),
+        (MIGRATIONS_PATH, update_migrations(read_text(MIGRATIONS_PATH), spec, old_version, new_version)),
+        (DATABASE_MODULE_PATH, update_database_module(read_text(DATABASE_MODULE_PATH), spec)),
+    ], old_version, new_version
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="根据模型描述生成 Room 实体、DAO、迁移与注册代码")
+    parser.add_argument("spec", nargs="?", help="模型描述 JSON 文件")
+    parser.add_argument("--dry-run", action="store_true", help="只输出生成计划，不写入文件")
+    parser.add_argument("--example", action="store_true", help="输出模型描述示例")
+
+    args = parser.parse_args(argv)
+
+    if args.example:
+        print(json.dumps(EXAMPLE_SPEC, ensure_ascii=False, indent=2))
+        return
+    if not args.spec:
+        parser.error("需要指定模型描述文件")
+
+    # 在切换到项目根目录之前解析相对路径
+    spec_path = os.path.abspath(args.spec)
+    enter_repo_root()
+
+    try:
+        spec = load_spec(spec_path)
+        derived = derive_indices(spec)
+        files, old_version, new_version = generate(spec)
+    except SpecError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    print(f"开始生成 Room 文件: {spec.entity_class} (表 {spec.table})")
+    for index in spec.indices:
+        origin = "根据查询模式自动添加" if index.derived else "模型描述声明"
+        unique = " UNIQUE" if index.unique else ""
+        print(f"  索引{unique} {index_name(spec, index)}  ({origin})")
+    if not derived and spec.queries:
+        print("  查询模式均已被主键或声明的索引覆盖")
+    print(f"  数据库版本: {old_version} -> {new_version}")
+
+    for path, content in files:
+        if args.dry_run:
+            print(f"  将写入 {path}")
+            continue
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        print(f"  已写入 {path}")
+
+    if args.dry_run:
+        print("dry-run 模式，未写入任何文件")
+    else:
+        print("Room 文件生成完成！")
+        print(f"下一步: 在 Repository 中注入 {spec.dao_class}，并运行 python scripts/validate_module.py {DB_MODULE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,11 @@ Atlas Framework - UI文件生成脚本
 使用方法: python scripts/create_ui_files.py feature-modulename
 """
 
-import os
 import sys
 import argparse
 
-
-def to_camel_case(snake_str):
-    """将下划线分隔的字符串转换为驼峰命名"""
-    components = snake_str.split('-')
-    return ''.join(word.capitalize() for word in components)
+from atlas_cli.model import project_tree
+from atlas_cli.project import to_camel_case, enter_repo_root
 
 
 def create_viewmodel(module_dir, feature_name, feature_name_camel):
@@ -256,18 +252,17 @@ class {feature_name_camel}ViewModelTest {{
         f.write(content)
 
 
-def update_settings_gradle(module_name):
+def update_settings_gradle(tree, module_name):
     """更新 settings.gradle.kts"""
     print("更新项目配置...")
     
     settings_file = "settings.gradle.kts"
-    if not os.path.exists(settings_file):
+    if not tree.exists(settings_file):
         print(f"警告: {settings_file} 不存在")
         return
     
     # 读取现有内容
-    with open(settings_file, "r", encoding="utf-8") as f:
-        content = f.read()
+    content = tree.read_text(settings_file)
     
     # 检查是否已经包含该模块
     include_line = f'include(":{module_name}")'
@@ -275,17 +270,20 @@ def update_settings_gradle(module_name):
         # 添加模块
         with open(settings_file, "a", encoding="utf-8") as f:
             f.write(f"\n{include_line}\n")
+        tree.invalidate(settings_file)
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="生成 Atlas 功能模块 UI 文件")
     parser.add_argument("module_name", help="模块名称 (例如: feature-login)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     module_name = args.module_name
     
+    tree = project_tree(enter_repo_root())
+    
     # 检查模块是否存在
-    if not os.path.exists(module_name):
+    if not tree.exists(module_name):
         print(f"错误: 模块 {module_name} 不存在")
         sys.exit(1)
     
@@ -303,7 +301,7 @@ def main():
     create_test_file(module_name, feature_name, feature_name_camel)
     
     # 更新项目配置
-    update_settings_gradle(module_name)
+    update_settings_gradle(tree, module_name)
     
     print(f"UI 文件生成完成！")
     print("")
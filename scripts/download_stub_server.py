@@ -0,0 +1,716 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 下载桩服务器与断点续传基准
+使用方法:
+    python scripts/download_stub_server.py serve [--size 64M | --file app.apk] [--latency 50] [--bandwidth 2048] [--drop-rate 0.05]
+    python scripts/download_stub_server.py bench [--size 32M] [--parallel 1,2,4,8] [--resume-at 0.5]
+
+serve 在本地提供一个支持 Range / If-Range / ETag 的静态文件服务，可注入首字节延迟、
+单连接限速和随机断流，用于在模拟器 (http://10.0.2.2:<port>/payload.bin) 或真机上
+验证 core-network 的 DownloadManager，无需真实后端。
+
+bench 在进程内启动同样的服务器，用 Python 客户端按 DownloadManager 的协议 (bytes=0-0 探测、
+按分段并行 Range 请求、If-Range、.part + .part.state 断点状态、指数退避重试、SHA-256 校验)
+离线测量不同并行度下的吞吐、重试次数和续传效果，并与旧实现 (单连接、断流后从头下载) 对比。
+bench 衡量的是协议和参数，不运行 Kotlin 的 DownloadManager；分段大小和重试参数运行时
+从项目中的 NetworkConfig.kt 读取。DownloadManager 本身的行为由 core-network 的
+DownloadManagerTest (MockWebServer) 覆盖，真机或模拟器上的效果请让应用访问 serve。
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import socket
+import hashlib
+import argparse
+import threading
+import http.client
+
+
+PAYLOAD_NAME = "payload.bin"
+CHUNK_SIZE = 16 * 1024
+
+NETWORK_CONFIG_FILE = os.path.join(
+    "core-network", "src", "main", "java", "com", "sword", "atlas", "core", "network", "config", "NetworkConfig.kt")
+NETWORK_CONST_RE = re.compile(r"const val (\w+) = ([\d.L* ]+)")
+
+# bench 使用的 NetworkConfig.Transfer / NetworkConfig.Retry 常量 (时间单位为毫秒)；
+# 找不到 NetworkConfig.kt 时使用这里的默认值
+NETWORK_CONFIG_DEFAULTS = {
+    "MIN_SEGMENT_SIZE": 1024 * 1024,
+    "STATE_SAVE_INTERVAL": 1000,
+    "MAX_RETRIES": 3,
+    "INITIAL_DELAY": 1000,
+    "MAX_DELAY": 10000,
+    "MULTIPLIER": 2.0,
+}
+
+STATE_HEADER = "atlas-download-state 1"
+
+
+def parse_size(text):
+    """解析 64M / 512K / 1G / 字节数"""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def load_network_config():
+    """
+    从项目中的 NetworkConfig.kt 读取 bench 使用的常量
+
+    @return (常量字典, 读取的文件路径)；找不到文件时返回默认值和 None
+    """
+    config = dict(NETWORK_CONFIG_DEFAULTS)
+    try:
+        from atlas_cli.project import find_repo_root
+        root = find_repo_root()
+    except ImportError:
+        root = None
+    path = os.path.join(root, NETWORK_CONFIG_FILE) if root else None
+    if path is None or not os.path.isfile(path):
+        return config, None
+    with open(path, "r", encoding="utf-8") as f:
+        for name, expression in NETWORK_CONST_RE.findall(f.read()):
+            if name in config:
+                value = 1
+                for factor in expression.split("*"):
+                    value *= float(factor.strip().rstrip("L"))
+                config[name] = type(NETWORK_CONFIG_DEFAULTS[name])(value)
+    return config, path
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size}B"
+        size /= 1024
+
+
+# ---------------------------------------------------------------------------
+# 服务端
+# ---------------------------------------------------------------------------
+
+class Payload:
+    """被下载的内容: 随机生成或来自本地文件"""
+
+    def __init__(self, size=None, path=None):
+        if path:
+            self.path = path
+            self.size = os.path.getsize(path)
+            self.data = None
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            self.sha256 = digest.hexdigest()
+            self.name = os.path.basename(path)
+        else:
+            self.path = None
+            self.size = size
+            self.data = os.urandom(size)
+            self.sha256 = hashlib.sha256(self.data).hexdigest()
+            self.name = PAYLOAD_NAME
+        self.etag = f'"{self.sha256[:16]}"'
+        self.last_modified = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())
+
+    def read(self, offset, length):
+        if self.data is not None:
+            return self.data[offset:offset + length]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+class Faults:
+    """注入的网络故障"""
+
+    def __init__(self, latency=0.0, jitter=0.0, bandwidth=0, drop_rate=0.0, no_range=False, seed=None):
+        self.latency = latency / 1000.0
+        self.jitter = jitter / 1000.0
+        self.bandwidth = bandwidth * 1024
+        self.drop_rate = drop_rate
+        self.no_range = no_range
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def first_byte_delay(self):
+        with self.lock:
+            return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def drop_point(self, length):
+        """返回断流前发送的字节数，不断流时返回 None"""
+        with self.lock:
+            if length > 0 and self.random.random() < self.drop_rate:
+                return self.random.randrange(length)
+        return None
+
+
+class ServerStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.drops = 0
+
+    def add(self, requests=0, bytes_sent=0, drops=0):
+        with self.lock:
+            self.requests += requests
+            self.bytes_sent += bytes_sent
+            self.drops += drops
+
+
+def parse_range(header, size):
+    """
+    解析单个 Range: bytes=a-b / bytes=a- / bytes=-n
+
+    @return (start, end)；无法满足时返回 "invalid"；没有或不支持的格式返回 None
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                return "invalid"
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return "invalid"
+    return start, min(end, size - 1)
+
+
+def make_handler(payload, faults, stats, verbose):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            if verbose:
+                sys.stderr.write("%s - %s\n" % (self.address_string(), format % args))
+
+        def do_HEAD(self):
+            self.respond(send_body=False)
+
+        def do_GET(self):
+            self.respond(send_body=True)
+
+        def respond(self, send_body):
+            stats.add(requests=1)
+            if self.path.split("?")[0].lstrip("/") != payload.name:
+                self.send_error(404)
+                return
+            time.sleep(faults.first_byte_delay())
+
+            byte_range = None
+            if not faults.no_range:
+                byte_range = parse_range(self.headers.get("Range"), payload.size)
+                # If-Range 与当前 ETag / Last-Modified 不一致时返回完整内容
+                if_range = self.headers.get("If-Range")
+                if byte_range and if_range and if_range not in (payload.etag, payload.last_modified):
+                    byte_range = None
+
+            if byte_range == "invalid":
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{payload.size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            start, end = byte_range or (0, payload.size - 1)
+            length = end - start + 1 if payload.size else 0
+            self.send_response(206 if byte_range else 200)
+            if byte_range:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{payload.size}")
+            if not faults.no_range:
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("ETag", payload.etag)
+                self.send_header("Last-Modified", payload.last_modified)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(length))
+            self.end_headers()
+            if send_body:
+                self.send_body(start, length)
+
+        def send_body(self, start, length):
+            drop_at = faults.drop_point(length)
+            limit = length if drop_at is None else drop_at
+            sent = 0
+            began = time.monotonic()
+            try:
+                while sent < limit:
+                    chunk = payload.read(start + sent, min(CHUNK_SIZE, limit - sent))
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    if faults.bandwidth:
+                        # 单连接限速: 发送进度超前于带宽时等待
+                        ahead = began + sent / faults.bandwidth - time.monotonic()
+                        if ahead > 0:
+                            time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+                return
+            finally:
+                stats.add(bytes_sent=sent)
+            if drop_at is not None:
+                # 模拟弱网断流: 声明的 Content-Length 未发送完就关闭连接
+                stats.add(drops=1)
+                self.close_connection = True
+                try:
+                    self.wfile.flush()
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    return Handler
+
+
+def start_server(host, port, payload, faults, verbose=False):
+    """启动服务器线程，返回 (server, stats)"""
+    from http.server import ThreadingHTTPServer
+
+    stats = ServerStats()
+    server = ThreadingHTTPServer((host, port), make_handler(payload, faults, stats, verbose))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+# ---------------------------------------------------------------------------
+# 基准客户端 (DownloadManager 协议的 Python 实现，不运行 Kotlin 代码)
+# ---------------------------------------------------------------------------
+
+class Aborted(Exception):
+    """模拟下载中途被取消"""
+
+
+class Segment:
+    def __init__(self, start, end, downloaded=0):
+        self.start = start
+        self.end = end
+        self.downloaded = downloaded
+
+    @property
+    def length(self):
+        return self.end - self.start + 1
+
+    @property
+    def complete(self):
+        return self.downloaded >= self.length
+
+    @property
+    def next_offset(self):
+        return self.start + self.downloaded
+
+
+def split_segments(total, parallelism, min_segment_size):
+    """与 DownloadState.split 相同的分段规则"""
+    if total <= 0:
+        return []
+    count = max(1, min(parallelism, total // max(1, min_segment_size)))
+    base, remainder = divmod(total, count)
+    segments, start = [], 0
+    for index in range(count):
+        size = base + (1 if index < remainder else 0)
+        segments.append(Segment(start, start + size - 1))
+        start += size
+    return segments
+
+
+def encode_state(url, total, validator, segments):
+    lines = [STATE_HEADER, f"url={url}", f"total={total}", f"validator={validator}"]
+    lines.extend(f"segment={s.start},{s.end},{s.downloaded}" for s in segments)
+    return "\n".join(lines) + "\n"
+
+
+def decode_state(text):
+    """解析断点状态，格式不正确时返回 None"""
+    lines = [line for line in text.splitlines() if line]
+    if not lines or lines[0] != STATE_HEADER:
+        return None
+    values, segments = {}, []
+    for line in lines[1:]:
+        key, _, value = line.partition("=")
+        if key == "segment":
+            try:
+                start, end, downloaded = (int(part) for part in value.split(","))
+            except ValueError:
+                return None
+            segments.append(Segment(start, end, downloaded))
+        else:
+            values[key] = value
+    if "url" not in values or "total" not in values or not segments:
+        return None
+    return values["url"], int(values["total"]), values.get("validator", ""), segments
+
+
+class ClientStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.bytes_received = 0
+
+    def add(self, requests=0, retries=0, bytes_received=0):
+        with self.lock:
+            self.requests += requests
+            self.retries += retries
+            self.bytes_received += bytes_received
+
+
+class RangeDownloader:
+    """分段并行下载客户端 (DownloadManager 协议的 Python 实现，用于 bench)"""
+
+    def __init__(self, host, port, path, parallelism, config, retry_delay=None, timeout=30.0):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.url = f"http://{host}:{port}{path}"
+        self.parallelism = parallelism
+        self.config = config
+        self.retry_delay = config["INITIAL_DELAY"] / 1000 if retry_delay is None else retry_delay
+        self.timeout = timeout
+        self.stats = ClientStats()
+
+    def connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def probe(self):
+        """bytes=0-0 探测，返回 (总大小, 校验信息)；不支持 Range 时返回 None"""
+        conn = self.connect()
+        try:
+            conn.request("GET", self.path, headers={"Range": "bytes=0-0"})
+            response = conn.getresponse()
+            response.read()
+            self.stats.add(requests=1)
+            if response.status != 206:
+                return None
+            content_range = response.getheader("Content-Range", "")
+            total = int(content_range.rpartition("/")[2])
+            etag = response.getheader("ETag")
+            validator = etag if etag and not etag.startswith("W/") else response.getheader("Last-Modified", "")
+            return total, validator
+        finally:
+            conn.close()
+
+    def download(self, dest, abort_after=None):
+        """
+        下载到 dest，断点状态保存在 dest.part.state
+
+        @param abort_after 累计下载超过该字节数时中止 (模拟取消)，状态保留用于续传
+        @return 本次是否完成
+        """
+        part_path, state_path = dest + ".part", dest + ".part.state"
+        probed = self.retry_io(self.probe)
+        if probed is None:
+            raise RuntimeError("服务器不支持 Range 请求")
+        total, validator = probed
+
+        segments = None
+        if os.path.exists(state_path) and os.path.exists(part_path) and os.path.getsize(part_path) == total:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = decode_state(f.read())
+            if state and state[:3] == (self.url, total, validator):
+                segments = state[3]
+        if segments is None:
+            segments = split_segments(total, self.parallelism, self.config["MIN_SEGMENT_SIZE"])
+            with open(part_path, "wb") as f:
+                f.truncate(total)
+
+        received_at_start = self.stats.bytes_received
+        abort = threading.Event()
+        done = threading.Event()
+        errors = []
+
+        def save_state():
+            content = encode_state(self.url, total, validator, segments)
+            with open(part_path, "r+b") as f:
+                os.fsync(f.fileno())
+            with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(state_path + ".tmp", state_path)
+
+        def reporter():
+            while not done.wait(self.config["STATE_SAVE_INTERVAL"] / 1000):
+                save_state()
+
+        def worker(segment):
+            try:
+                self.download_segment(segment, validator, part_path, abort, abort_after, received_at_start)
+            except Aborted:
+                pass
+            except Exception as e:  # 与协程实现一致: 一个分段失败则整体失败
+                errors.append(e)
+                abort.set()
+
+        threads = [threading.Thread(target=worker, args=(s,)) for s in segments if not s.complete]
+        reporter_thread = threading.Thread(target=reporter, daemon=True)
+        reporter_thread.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        reporter_thread.join()
+        save_state()
+
+        if errors:
+            raise errors[0]
+        if not all(s.complete for s in segments):
+            return False
+        os.replace(part_path, dest)
+        os.remove(state_path)
+        return True
+
+    def retry_io(self, action, made_progress=lambda: False, abort=None):
+        """与 DownloadManager.retryIo 相同的指数退避重试"""
+        attempt, delay = 0, self.retry_delay
+        while True:
+            try:
+                return action()
+            except (OSError, EOFError, ValueError, http.client.HTTPException):
+                if made_progress():
+                    attempt, delay = 0, self.retry_delay
+                attempt += 1
+                if attempt > self.config["MAX_RETRIES"]:
+                    raise
+                self.stats.add(retries=1)
+                if abort is not None and abort.wait(delay):
+                    raise Aborted()
+                if abort is None:
+                    time.sleep(delay)
+                delay = min(delay * self.config["MULTIPLIER"], self.config["MAX_DELAY"] / 1000)
+
+    def download_segment(self, segment, validator, part_path, abort, abort_after, received_at_start):
+        progress = [segment.downloaded]
+
+        def made_progress():
+            advanced = segment.downloaded > progress[0]
+            progress[0] = segment.downloaded
+            return advanced
+
+        with open(part_path, "r+b") as f:
+            def attempt():
+                # 每次尝试使用新连接，断流后旧连接不可复用
+                conn = self.connect()
+                try:
+                    self.fetch_range(conn, segment, validator, f, abort, abort_after, received_at_start)
+                finally:
+                    conn.close()
+
+            self.retry_io(attempt, made_progress, abort)
+
+    def fetch_range(self, conn, segment, validator, f, abort, abort_after, received_at_start):
+        headers = {"Range": f"bytes={segment.next_offset}-{segment.end}"}
+        if validator:
+            headers["If-Range"] = validator
+        conn.request("GET", self.path, headers=headers)
+        response = conn.getresponse()
+        self.stats.add(requests=1)
+        if response.status != 206:
+            response.read()
+            raise RuntimeError(f"服务器文件已变化 (HTTP {response.status})")
+        content_range = response.getheader("Content-Range", "")
+        if not content_range.startswith(f"bytes {segment.next_offset}-"):
+            raise RuntimeError("服务器返回的分段与请求不一致")
+        try:
+            while not segment.complete:
+                if abort.is_set():
+                    raise Aborted()
+                chunk = response.read(min(64 * 1024, segment.length - segment.downloaded))
+                if not chunk:
+                    raise EOFError("分段数据提前结束")
+                f.seek(segment.next_offset)
+                f.write(chunk)
+                segment.downloaded += len(chunk)
+                self.stats.add(bytes_received=len(chunk))
+                if abort_after is not None and self.stats.bytes_received - received_at_start >= abort_after:
+                    abort.set()
+        except http.client.IncompleteRead as e:
+            raise EOFError(str(e))
+
+
+def restart_download(host, port, path, dest, retry_delay, max_attempts=20):
+    """旧实现: 单连接下载，断流后从头重新下载"""
+    stats = ClientStats()
+    for _ in range(max_attempts):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            stats.add(requests=1)
+            with open(dest, "wb") as f:
+                while True:
+                    chunk = response.read(64 * 1024)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    stats.add(bytes_received=len(chunk))
+            if os.path.getsize(dest) == int(response.getheader("Content-Length", "-1")):
+                return True, stats
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            conn.close()
+        stats.add(retries=1)
+        time.sleep(retry_delay)
+    return False, stats
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_bench(args):
+    import tempfile
+
+    config, config_path = load_network_config()
+    retry_delay = config["INITIAL_DELAY"] / 1000 if args.retry_delay is None else args.retry_delay
+    payload = Payload(size=parse_size(args.size))
+    faults = Faults(args.latency, args.jitter, args.bandwidth, args.drop_rate, seed=args.seed)
+    server, server_stats = start_server("127.0.0.1", 0, payload, faults)
+    host, port = server.server_address[:2]
+    path = "/" + payload.name
+
+    print(f"payload {format_size(payload.size)}  latency {args.latency:g}ms  "
+          f"bandwidth {args.bandwidth or '不限'}{'KB/s' if args.bandwidth else ''}/连接  drop-rate {args.drop_rate:g}")
+    print(f"参数: {config_path or '未找到 NetworkConfig.kt，使用内置默认值'}  "
+          f"重试 {config['MAX_RETRIES']} 次，首次等待 {retry_delay:g}s")
+    print(f"{'strategy':<14}{'time':>9}{'throughput':>12}{'reqs':>7}{'retry':>6}{'recv/size':>11}  result")
+
+    def report(label, elapsed, ok, stats, dest):
+        verified = ok and file_sha256(dest) == payload.sha256
+        result = "OK" if verified else ("校验失败" if ok else "失败")
+        throughput = f"{payload.size / elapsed / 1024 / 1024:.2f}MB/s" if verified else "-"
+        ratio = stats.bytes_received / payload.size
+        print(f"{label:<14}{elapsed:>8.2f}s{throughput:>12}{stats.requests:>7}{stats.retries:>6}{ratio:>10.2f}x  {result}")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for repeat in range(args.repeat):
+            if not args.skip_baseline:
+                dest = os.path.join(work_dir, f"restart-{repeat}.bin")
+                began = time.monotonic()
+                ok, stats = restart_download(host, port, path, dest, retry_delay)
+                report("restart x1", time.monotonic() - began, ok, stats, dest)
+
+            for parallelism in args.parallel:
+                dest = os.path.join(work_dir, f"range-{parallelism}-{repeat}.bin")
+                client = RangeDownloader(host, port, path, parallelism, config, retry_delay)
+                began = time.monotonic()
+                try:
+                    ok = client.download(dest)
+                except Exception as e:
+                    print(f"  range x{parallelism} 失败: {e}")
+                    ok = False
+                report(f"range x{parallelism}", time.monotonic() - began, ok, client.stats, dest)
+
+        if args.resume_at:
+            # 中途取消后续传: 第二次只应下载剩余部分
+            parallelism = args.parallel[-1]
+            dest = os.path.join(work_dir, "resume.bin")
+            abort_after = int(payload.size * args.resume_at)
+            first = RangeDownloader(host, port, path, parallelism, config, retry_delay)
+            first.download(dest, abort_after=abort_after)
+            second = RangeDownloader(host, port, path, parallelism, config, retry_delay)
+            began = time.monotonic()
+            ok = second.download(dest)
+            elapsed = time.monotonic() - began
+            verified = ok and file_sha256(dest) == payload.sha256
+            print("")
+            print(f"续传 (x{parallelism}，在 {args.resume_at:.0%} 处取消): "
+                  f"取消前接收 {format_size(first.stats.bytes_received)}，"
+                  f"续传接收 {format_size(second.stats.bytes_received)}，"
+                  f"合计 {(first.stats.bytes_received + second.stats.bytes_received) / payload.size:.2f}x 文件大小，"
+                  f"续传耗时 {elapsed:.2f}s  {'OK' if verified else '失败'}")
+
+    server.shutdown()
+    print("")
+    print(f"服务器: {server_stats.requests} 个请求，发送 {format_size(server_stats.bytes_sent)}，"
+          f"注入断流 {server_stats.drops} 次")
+
+
+def run_serve(args):
+    payload = Payload(path=args.file) if args.file else Payload(size=parse_size(args.size))
+    faults = Faults(args.latency, args.jitter, args.bandwidth, args.drop_rate, args.no_range, args.seed)
+    server, stats = start_server(args.host, args.port, payload, faults, args.verbose)
+    port = server.server_address[1]
+
+    print(f"下载桩服务器已启动: http://{args.host}:{port}/{payload.name}")
+    print(f"  模拟器访问: http://10.0.2.2:{port}/{payload.name}")
+    print(f"  大小: {payload.size} bytes ({format_size(payload.size)})")
+    print(f"  SHA-256: {payload.sha256}")
+    print(f"  ETag: {payload.etag}  Range: {'关闭' if args.no_range else '支持'}")
+    print("按 Ctrl+C 停止")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("")
+        print(f"共 {stats.requests} 个请求，发送 {format_size(stats.bytes_sent)}，注入断流 {stats.drops} 次")
+
+
+def add_fault_arguments(parser, latency=0, bandwidth=0):
+    parser.add_argument("--latency", type=float, default=latency,
+                        help="每个响应的首字节延迟，单位毫秒 (默认 %(default)g)")
+    parser.add_argument("--jitter", type=float, default=0, help="延迟抖动范围，单位毫秒")
+    parser.add_argument("--bandwidth", type=int, default=bandwidth,
+                        help="单连接限速，单位 KB/s，0 表示不限 (默认 %(default)s)")
+    parser.add_argument("--drop-rate", type=float, default=0, help="响应中途断流的概率 (0-1)")
+    parser.add_argument("--seed", type=int, help="故障注入的随机种子，便于复现")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="下载桩服务器与断点续传吞吐基准")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="启动下载桩服务器")
+    serve_parser.add_argument("--host", default="0.0.0.0", help="监听地址 (默认 0.0.0.0)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="监听端口 (默认 8765)")
+    serve_parser.add_argument("--size", default="64M", help="随机内容大小 (默认 64M)")
+    serve_parser.add_argument("--file", help="改为提供本地文件")
+    serve_parser.add_argument("--no-range", action="store_true", help="不支持 Range 请求 (验证单连接降级)")
+    serve_parser.add_argument("--verbose", action="store_true", help="输出访问日志")
+    add_fault_arguments(serve_parser)
+
+    bench_parser = subparsers.add_parser("bench", help="用 Python 客户端离线测量协议的吞吐与续传效果")
+    bench_parser.add_argument("--size", default="32M", help="测试文件大小 (默认 32M)")
+    bench_parser.add_argument("--parallel", default="1,2,4,8",
+                              type=lambda text: [int(item) for item in text.split(",") if item],
+                              help="要测试的并行分段数，逗号分隔 (默认 1,2,4,8)")
+    bench_parser.add_argument("--repeat", type=int, default=1, help="重复次数")
+    bench_parser.add_argument("--resume-at", type=float, default=0.5,
+                              help="续传测试在下载到该比例时取消，0 表示跳过 (默认 0.5)")
+    bench_parser.add_argument("--retry-delay", type=float,
+                              help="首次重试等待秒数 (默认取 NetworkConfig.Retry.INITIAL_DELAY)")
+    bench_parser.add_argument("--skip-baseline", action="store_true", help="跳过旧实现 (断流后从头下载) 的对比")
+    add_fault_arguments(bench_parser, latency=50, bandwidth=4096)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.action == "serve":
+            run_serve(args)
+        else:
+            run_bench(args)
+    except OSError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
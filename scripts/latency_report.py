@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - logcat 延迟分析脚本
+使用方法:
+    python scripts/latency_report.py capture.txt [capture2.txt.gz ...]
+    adb logcat -v threadtime | python scripts/latency_report.py -
+    python scripts/latency_report.py capture.txt --window 60
+    python scripts/latency_report.py new.txt --compare baseline.txt
+
+解析 core-network (NetworkTiming) 与 core-router (RouteTiming) 输出的结构化耗时记录:
+    ts=1729328400123 kind=http method=GET host=api.example.com path=/v1/user status=200 result=ok duration_ms=123
+    ts=1729328400456 kind=route path=/user/profile result=success duration_ms=42
+
+按接口 / 路由统计 p50/p95/p99。输入逐行流式读取，分位数使用相对误差有界的
+对数分桶 sketch，内存占用与日志大小无关。
+"""
+
+import re
+import sys
+import gzip
+import json
+import math
+import time
+import argparse
+
+
+RECORD_RE = re.compile(r"\bts=(\d+) kind=(\w+) (.*)$")
+
+# 路径中的 ID 类片段会被归并，避免同一接口被拆成大量不同的 key
+ID_SEGMENT_RE = re.compile(
+    r"^(?:\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+
+OVERFLOW_KEY = "(other)"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class QuantileSketch:
+    """
+    对数分桶分位数 sketch (DDSketch 思路)
+
+    每个桶覆盖 [gamma^(i-1), gamma^i)，任意分位数的相对误差不超过 accuracy。
+    桶数超过 max_bins 时合并最小的桶，因此内存有上界；sketch 之间可以合并。
+    """
+
+    def __init__(self, accuracy=0.01, max_bins=2048):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.zero_count += other.zero_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for index, n in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + n
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        """把最小的两个桶合并，保证高分位数的精度"""
+        lowest, second = sorted(self.bins)[:2]
+        self.bins[second] += self.bins.pop(lowest)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+class EndpointStats:
+    """单个接口 / 路由的统计"""
+
+    def __init__(self, accuracy):
+        self.sketch = QuantileSketch(accuracy)
+        self.errors = 0
+
+    def add(self, duration, failed):
+        self.sketch.add(duration)
+        if failed:
+            self.errors += 1
+
+    def summary(self):
+        sketch = self.sketch
+        result = {
+            "count": sketch.count,
+            "errors": self.errors,
+            "mean": sketch.total / sketch.count if sketch.count else None,
+            "max": sketch.max if sketch.count else None,
+        }
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}"] = sketch.quantile(q)
+        return result
+
+
+class Aggregator:
+    """按 key 聚合耗时，key 数量超过上限时归入 (other)"""
+
+    def __init__(self, accuracy=0.01, max_keys=1000):
+        self.accuracy = accuracy
+        self.max_keys = max_keys
+        self.stats = {}
+
+    def add(self, key, duration, failed):
+        stats = self.stats.get(key)
+        if stats is None:
+            if len(self.stats) >= self.max_keys:
+                key = OVERFLOW_KEY
+                stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = EndpointStats(self.accuracy)
+        stats.add(duration, failed)
+
+    def summaries(self):
+        return {key: stats.summary() for key, stats in sorted(self.stats.items())}
+
+
+def normalize_path(path):
+    """将 /v1/user/42 归并为 /v1/user/{id}"""
+    return "/".join("{id}" if ID_SEGMENT_RE.match(s) else s for s in path.split("/"))
+
+
+def parse_record(line, normalize=True):
+    """
+    解析一行日志中的结构化耗时记录
+
+    @return (时间戳毫秒, key, 耗时毫秒, 是否失败)，不是耗时记录时返回 None
+    """
+    match = RECORD_RE.search(line.rstrip())
+    if not match:
+        return None
+    fields = dict(token.split("=", 1) for token in match.group(3).split() if "=" in token)
+    try:
+        duration = float(fields["duration_ms"])
+    except (KeyError, ValueError):
+        return None
+    kind = match.group(2)
+    path = fields.get("path", "")
+    if normalize:
+        path = normalize_path(path)
+    if kind == "http":
+        key = f"http {fields.get('method', '?')} {fields.get('host', '')}{path}"
+    else:
+        key = f"{kind} {path}"
+    failed = fields.get("result") not in ("ok", "success")
+    return int(match.group(1)), key, duration, failed
+
+
+def open_input(path):
+    """打开输入文件，支持 '-' (标准输入) 与 .gz"""
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def iter_records(paths, kinds=None, normalize=True):
+    """逐行流式读取所有输入并产出耗时记录"""
+    for path in paths:
+        f = open_input(path)
+        try:
+            for line in f:
+                # 绝大多数日志行不是耗时记录，先做廉价的子串过滤
+                if " kind=" not in line:
+                    continue
+                record = parse_record(line, normalize)
+                if record is None:
+                    continue
+                if kinds and record[1].split(" ", 1)[0] not in kinds:
+                    continue
+                yield record
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def aggregate(paths, args):
+    """汇总全部输入"""
+    aggregator = Aggregator(args.accuracy, args.max_keys)
+    for _, key, duration, failed in iter_records(paths, args.kind, not args.no_normalize):
+        aggregator.add(key, duration, failed)
+    return aggregator
+
+
+def iter_windows(paths, args):
+    """
+    按时间窗口聚合，窗口关闭后立即产出
+
+    允许一个窗口的乱序，更晚到达的记录计入 late 并丢弃，保证内存有界
+    """
+    window_ms = int(args.window * 1000)
+    open_windows = {}
+    newest = None
+    late = 0
+    for ts, key, duration, failed in iter_records(paths, args.kind, not args.no_normalize):
+        index = ts // window_ms
+        if newest is not None and index < newest - 1:
+            late += 1
+            continue
+        if newest is None or index > newest:
+            newest = index
+            for closed in sorted(i for i in open_windows if i < newest - 1):
+                yield closed * window_ms, window_ms, open_windows.pop(closed)
+        aggregator = open_windows.get(index)
+        if aggregator is None:
+            aggregator = open_windows[index] = Aggregator(args.accuracy, args.max_keys)
+        aggregator.add(key, duration, failed)
+    for index in sorted(open_windows):
+        yield index * window_ms, window_ms, open_windows.pop(index)
+    if late:
+        print(f"警告: {late} 条记录晚于窗口关闭时间，已忽略", file=sys.stderr)
+
+
+def fmt_ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def print_table(summaries):
+    """输出统计表"""
+    if not summaries:
+        print("(没有耗时记录)")
+        return
+    width = max(len(key) for key in summaries)
+    print(f"{'KEY':<{width}}  {'count':>7}  {'err':>5}  {'p50':>8}  {'p95':>8}  {'p99':>8}  {'max':>8}")
+    for key, s in summaries.items():
+        print(f"{key:<{width}}  {s['count']:>7}  {s['errors']:>5}  {fmt_ms(s['p50']):>8}  "
+              f"{fmt_ms(s['p95']):>8}  {fmt_ms(s['p99']):>8}  {fmt_ms(s['max']):>8}")
+
+
+def fmt_delta(base, new):
+    if base is None or new is None:
+        return "-"
+    if base == 0:
+        return "n/a"
+    return f"{(new - base) / base * 100:+.1f}%"
+
+
+def compare(baseline, candidate):
+    """比较两次采集的分位数"""
+    result = {}
+    for key in sorted(set(baseline) | set(candidate)):
+        base = baseline.get(key, {})
+        new = candidate.get(key, {})
+        row = {"count": [base.get("count", 0), new.get("count", 0)]}
+        for q in ("p50", "p95", "p99"):
+            row[q] = [base.get(q), new.get(q), fmt_delta(base.get(q), new.get(q))]
+        result[key] = row
+    return result
+
+
+def print_comparison(rows):
+    """输出对比表"""
+    if not rows:
+        print("(没有耗时记录)")
+        return
+    width = max(len(key) for key in rows)
+    header = f"{'KEY':<{width}}  {'count':>13}"
+    for q in ("p50", "p95", "p99"):
+        header += f"  {q + ' base→new (Δ)':>26}"
+    print(header)
+    for key, row in rows.items():
+        line = f"{key:<{width}}  {row['count'][0]:>6}→{row['count'][1]:<6}"
+        for q in ("p50", "p95", "p99"):
+            base, new, delta = row[q]
+            line += f"  {fmt_ms(base):>8}→{fmt_ms(new):<8} {delta:>8}"
+        print(line)
+
+
+def format_window(start_ms, window_ms):
+    start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start_ms / 1000))
+    end = time.strftime("%H:%M:%S", time.localtime((start_ms + window_ms) / 1000))
+    return f"{start} - {end}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="统计 logcat 中的网络请求与路由导航延迟分布")
+    parser.add_argument("inputs", nargs="+", help="logcat 文件 (支持 .gz)，'-' 表示标准输入")
+    parser.add_argument("--kind", action="append", choices=["http", "route"],
+                        help="只统计指定类型，可重复指定 (默认全部)")
+    parser.add_argument("--window", type=float, metavar="SECONDS", help="按时间窗口分别统计")
+    parser.add_argument("--compare", nargs="+", metavar="BASELINE", help="与基线采集进行对比")
+    parser.add_argument("--accuracy", type=float, default=0.01, help="分位数相对误差 (默认 0.01)")
+    parser.add_argument("--max-keys", type=int, default=1000, help="最多统计的 key 数量 (默认 1000)")
+    parser.add_argument("--no-normalize", action="store_true", help="不归并路径中的 ID 片段")
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出")
+
+    args = parser.parse_args(argv)
+    if args.window is not None and args.compare:
+        parser.error("--window 与 --compare 不能同时使用")
+    if not 0 < args.accuracy < 1:
+        parser.error("--accuracy 必须在 (0, 1) 之间")
+
+    try:
+        if args.compare:
+            rows = compare(aggregate(args.compare, args).summaries(),
+                           aggregate(args.inputs, args).summaries())
+            if args.json:
+                print(json.dumps(rows, ensure_ascii=False, indent=2))
+            else:
+                print_comparison(rows)
+        elif args.window is not None:
+            if args.window <= 0:
+                parser.error("--window 必须大于 0")
+            for start_ms, window_ms, aggregator in iter_windows(args.inputs, args):
+                summaries = aggregator.summaries()
+                if args.json:
+                    print(json.dumps({"window_start": start_ms, "window_ms": window_ms,
+                                      "stats": summaries}, ensure_ascii=False))
+                else:
+                    print(f"== {format_window(start_ms, window_ms)} ==")
+                    print_table(summaries)
+                    print("")
+        else:
+            summaries = aggregate(args.inputs, args).summaries()
+            if args.json:
+                print(json.dumps(summaries, ensure_ascii=False, indent=2))
+            else:
+                print_table(summaries)
+    except BrokenPipeError:
+        # 输出被 head 等命令提前关闭
+        sys.stderr.close()
+        sys.exit(0)
+    except OSError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
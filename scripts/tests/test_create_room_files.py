@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+create_room_files 单元测试
+运行: python -m pytest scripts/tests  或  python -m unittest discover scripts/tests
+
+生成的 SQL 在内存 SQLite 中执行，检查索引推导和 keyset 分页的结果
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_room_files import (  # noqa: E402
+    EXAMPLE_SPEC, ModelSpec, covers, create_dao, create_index_sql, create_table_sql, derive_indices,
+)
+
+QUERY_RE = re.compile(r'@Query\("(.*)"\)\n\s*(?:suspend )?fun (\w+)\(')
+
+
+def make_spec(fields, primary_key, queries, **extra):
+    data = {"name": "Item", "fields": fields, "primaryKey": primary_key, "queries": queries}
+    data.update(extra)
+    spec = ModelSpec(data)
+    derive_indices(spec)
+    return spec
+
+
+def dao_queries(spec):
+    """DAO 方法名 -> @Query 中的 SQL"""
+    return {name: sql for sql, name in QUERY_RE.findall(create_dao(spec))}
+
+
+def create_database(spec):
+    db = sqlite3.connect(":memory:")
+    db.execute(create_table_sql(spec))
+    for index in spec.indices:
+        db.execute(create_index_sql(spec, index))
+    return db
+
+
+class DeriveIndicesTest(unittest.TestCase):
+
+    def test_example_spec_derives_indices_for_uncovered_queries(self):
+        spec = ModelSpec(EXAMPLE_SPEC)
+        derived = derive_indices(spec)
+        self.assertEqual([["authorId", "publishTime"], ["publishTime"]], [index.columns for index in derived])
+
+    def test_declared_index_with_matching_prefix_covers_query(self):
+        spec = make_spec(
+            [{"name": "id", "type": "Long"}, {"name": "owner", "type": "Long"}, {"name": "time", "type": "Long"}],
+            "id",
+            [{"type": "page", "by": ["owner"], "orderBy": "time"}],
+            indices=[["owner", "time"]],
+        )
+        self.assertEqual([], [index for index in spec.indices if index.derived])
+
+    def test_equality_columns_cover_in_any_order_but_sort_column_must_follow(self):
+        spec = make_spec(
+            [{"name": "id", "type": "Long"}, {"name": "a", "type": "Long"},
+             {"name": "b", "type": "Long"}, {"name": "time", "type": "Long"}],
+            "id",
+            [{"type": "key", "by": ["a", "b"], "orderBy": "time"}],
+        )
+        query = spec.queries[0]
+        self.assertTrue(covers(spec, ["b", "a", "time"], query))
+        self.assertTrue(covers(spec, ["a", "b", "time", "id"], query))
+        self.assertFalse(covers(spec, ["a", "time", "b"], query))
+        self.assertFalse(covers(spec, ["a", "b"], query))
+
+    def test_seek_index_includes_composite_key_tie_breakers(self):
+        spec = make_spec(
+            [{"name": "userId", "type": "Long"}, {"name": "tag", "type": "String"},
+             {"name": "score", "type": "Int"}],
+            ["userId", "tag"],
+            [{"type": "seek", "orderBy": "score"}],
+        )
+        self.assertEqual([["score", "userId", "tag"]], [i.columns for i in spec.indices if i.derived])
+
+    def test_seek_index_relies_on_rowid_for_single_integer_key(self):
+        spec = make_spec(
+            [{"name": "id", "type": "Long"}, {"name": "time", "type": "Long"}],
+            "id",
+            [{"type": "seek", "orderBy": "time"}],
+        )
+        self.assertEqual([["time"]], [i.columns for i in spec.indices if i.derived])
+
+
+class SeekQueryTest(unittest.TestCase):
+
+    def test_single_key_seek(self):
+        spec = make_spec(
+            [{"name": "id", "type": "Long"}, {"name": "time", "type": "Long"}],
+            "id",
+            [{"type": "seek", "orderBy": "time"}],
+        )
+        sql = dao_queries(spec)["getPageAfter"]
+        self.assertEqual(
+            "SELECT * FROM `item` WHERE `time` >= :afterTime AND (`time` > :afterTime OR `id` > :afterId) "
+            "ORDER BY `time`, `id` LIMIT :limit",
+            sql,
+        )
+        db = create_database(spec)
+        rows = [(i, i // 3) for i in range(1, 50)]
+        db.executemany("INSERT INTO item VALUES (?, ?)", rows)
+        self.assertEqual(sorted(rows, key=lambda r: (r[1], r[0])),
+                         self.read_pages(db, sql, {"afterTime": 1, "afterId": 0}, (-1, -1)))
+
+    def test_composite_key_seek(self):
+        spec = make_spec(
+            [{"name": "userId", "type": "Long"}, {"name": "tag", "type": "String"},
+             {"name": "score", "type": "Int"}],
+            ["userId", "tag"],
+            [{"type": "seek", "orderBy": "score"}],
+        )
+        sql = dao_queries(spec)["getPageAfter"]
+        self.assertEqual(
+            "SELECT * FROM `item` WHERE `score` >= :afterScore AND (`score` > :afterScore OR "
+            "`user_id` > :afterUserId OR (`user_id` = :afterUserId AND (`tag` > :afterTag))) "
+            "ORDER BY `score`, `user_id`, `tag` LIMIT :limit",
+            sql,
+        )
+        db = create_database(spec)
+        rows = [(user, f"t{tag}", (user * 7 + tag) % 4) for user in range(1, 14) for tag in range(15)]
+        db.executemany("INSERT INTO item VALUES (?, ?, ?)", rows)
+        self.assertEqual(sorted(rows, key=lambda r: (r[2], r[0], r[1])),
+                         self.read_pages(db, sql, {"afterScore": 2, "afterUserId": 0, "afterTag": 1},
+                                         (-1, -1, "")))
+
+    def test_descending_seek_with_equality_condition(self):
+        spec = make_spec(
+            [{"name": "id", "type": "Long"}, {"name": "authorId", "type": "Long"},
+             {"name": "publishTime", "type": "Long"}],
+            "id",
+            [{"type": "seek", "by": ["authorId"], "orderBy": "publishTime", "order": "desc"}],
+        )
+        sql = dao_queries(spec)["getPageByAuthorIdAfter"]
+        self.assertEqual(
+            "SELECT * FROM `item` WHERE `author_id` = :authorId AND `publish_time` <= :afterPublishTime "
+            "AND (`publish_time` < :afterPublishTime OR `id` < :afterId) "
+            "ORDER BY `publish_time` DESC, `id` DESC LIMIT :limit",
+            sql,
+        )
+        db = create_database(spec)
+        rows = [(i, i % 2, i // 4) for i in range(1, 60)]
+        db.executemany("INSERT INTO item VALUES (?, ?, ?)", rows)
+        expected = sorted((r for r in rows if r[1] == 1), key=lambda r: (r[2], r[0]), reverse=True)
+        self.assertEqual(expected, self.read_pages(db, sql, {"afterPublishTime": 2, "afterId": 0},
+                                                   (10 ** 9, 10 ** 9), authorId=1))
+
+    def test_seek_queries_use_index_without_sorting(self):
+        spec = make_spec(
+            [{"name": "userId", "type": "Long"}, {"name": "tag", "type": "String"},
+             {"name": "score", "type": "Int"}],
+            ["userId", "tag"],
+            [{"type": "seek", "orderBy": "score", "order": "desc"}],
+        )
+        db = create_database(spec)
+        sql = dao_queries(spec)["getPageAfter"]
+        plan = " ".join(row[-1] for row in db.execute(
+            "EXPLAIN QUERY PLAN " + sql, {"afterScore": 0, "afterUserId": 0, "afterTag": "", "limit": 1}))
+        self.assertIn("INDEX", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def read_pages(self, db, sql, cursor_columns, start, limit=7, **params):
+        """
+        从 start (排在所有行之前的游标值) 开始逐页读取
+
+        @param cursor_columns 游标参数名 -> 行中的列序号
+        """
+        names = list(cursor_columns)
+        cursor = dict(zip(names, start))
+        rows = []
+        while True:
+            page = db.execute(sql, dict(params, limit=limit, **cursor)).fetchall()
+            if not page:
+                return rows
+            rows.extend(page)
+            cursor = {name: page[-1][cursor_columns[name]] for name in names}
+
+
+class QuotingTest(unittest.TestCase):
+
+    def test_keyword_columns_are_quoted_in_every_query(self):
+        spec = make_spec(
+            [{"name": "id", "type": "Long"}, {"name": "group", "type": "Long"},
+             {"name": "order", "type": "Int"}],
+            "id",
+            [{"type": "key", "by": ["group"], "orderBy": "order", "replace": True},
+             {"type": "page", "by": ["group"], "orderBy": "order"},
+             {"type": "seek", "orderBy": "order"}],
+            table="index",
+        )
+        db = create_database(spec)
+        db.executemany("INSERT INTO `index` VALUES (?, ?, ?)", [(i, i % 3, i % 5) for i in range(1, 30)])
+        params = {"id": 1, "group": 1, "limit": 5, "offset": 0, "afterOrder": 0, "afterId": 0}
+        for name, sql in dao_queries(spec).items():
+            with self.subTest(name):
+                db.execute(sql, params)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Atlas Framework - 模块离线快速校验脚本
+使用方法: python scripts/validate_module.py [feature-modulename ...]
+
+无需 Gradle 同步即可交叉检查:
+- 包名与源码路径是否一致
+- com.sword.atlas.* 符号的 import 是否存在，且模块已声明对应依赖
+- ViewBinding 访问的 ID 是否存在于对应的布局 XML 中
+- 资源引用 (@drawable/xxx、R.string.xxx 等) 是否可以解析
+- settings.gradle.kts 是否包含所有模块
+
+解析结果按文件 (mtime, size) 缓存在 .atlas/validate-cache.json 中，
+未修改的文件无需重新解析。通过 atlas daemon 运行时直接使用内存中的项目模型，
+项目未变化时复用上一次构建的索引。
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+from atlas_cli.model import (
+    PACKAGE_RE, DiskTree, line_of, parse_namespace, parse_settings_includes, resident_model,
+)
+from atlas_cli.project import enter_repo_root
+
+
+CACHE_VERSION = 2
+CACHE_FILE = os.path.join(".atlas", "validate-cache.json")
+
+ATLAS_PACKAGE_PREFIX = "com.sword.atlas."
+
+# 只有这些类型的资源引用会被校验，其余类型 (style、attr 等) 大多来自三方库
+CHECKED_RESOURCE_TYPES = {
+    "drawable", "mipmap", "layout", "string", "dimen", "id",
+    "anim", "xml", "menu", "array", "integer", "bool", "font", "raw",
+}
+
+# 资源目录名前缀 -> 资源类型
+FILE_RESOURCE_DIRS = {
+    "drawable", "mipmap", "layout", "anim", "animator", "xml",
+    "menu", "raw", "font", "color", "navigation", "transition",
+}
+
+VALUES_TAG_TYPES = {
+    "string": "string",
+    "color": "color",
+    "dimen": "dimen",
+    "style": "style",
+    "bool": "bool",
+    "integer": "integer",
+    "array": "array",
+    "string-array": "array",
+    "integer-array": "array",
+    "plurals": "plurals",
+    "attr": "attr",
+    "declare-styleable": "styleable",
+}
+
+# ViewBinding 生成类自带的成员和 Kotlin 作用域函数 / Any 成员，不对应布局中的 ID
+BINDING_BUILTIN_MEMBERS = {
+    "root", "getRoot", "javaClass",
+    "apply", "run", "let", "also", "takeIf", "takeUnless",
+    "toString", "hashCode", "equals",
+}
+
+IMPORT_RE = re.compile(r"^import\s+([\w.]+)(\.\*)?", re.MULTILINE)
+DECL_RE = re.compile(
+    r"^(?:(?:public|internal|private|data|sealed|abstract|open|enum|annotation|"
+    r"inline|value|const|suspend|operator|infix|tailrec|expect|actual)\s+)*"
+    r"(?:class|interface|object|typealias|val|var|fun)\s+"
+    r"(?:<[^>]*>\s+)?"
+    r"(?:[\w.]+(?:<[^>]*>)?\??\.)?"
+    r"(\w+)",
+    re.MULTILINE,
+)
+# 只匹配属性访问: 布局 ID 生成的是字段，binding.xxx(...) / binding.xxx { } 是方法调用
+BINDING_ACCESS_RE = re.compile(r"\bbinding\??\.(\w+)\b(?!\s*[({])")
+R_REF_RE = re.compile(r"(?<![\w.])R\.(\w+)\.(\w+)")
+GRADLE_PROJECT_DEP_RE = re.compile(r'(\w+)\(\s*project\(\s*"(:[\w\-:]+)"\s*\)\s*\)')
+XML_VALUE_RE = re.compile(r'="(@(\+?)(?!android:)(\w+)/([\w.]+))"')
+XML_VALUES_DECL_RE = re.compile(r'<([\w\-]+)\s+[^>]*?\bname="([\w.]+)"([^>]*)>')
+XML_ITEM_TYPE_RE = re.compile(r'\btype="(\w+)"')
+KOTLIN_COMMENT_RE = re.compile(r'"""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|//[^\n]*|/\*[\s\S]*?\*/')
+
+
+def camel_to_snake(name):
+    """ActivityUserList -> activity_user_list"""
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+def id_to_field(resource_id):
+    """布局 ID 转换为 ViewBinding 字段名: btn_refresh -> btnRefresh"""
+    parts = resource_id.split("_")
+    return parts[0] + "".join(p[:1].upper() + p[1:] for p in parts[1:])
+
+
+# ---------------------------------------------------------------------------
+# 单文件解析 (结果可缓存)
+# ---------------------------------------------------------------------------
+
+def strip_comments(text):
+    """去掉 Kotlin 注释 (保留换行以维持行号)，避免 KDoc 示例代码被误判"""
+    def replace(m):
+        token = m.group(0)
+        if token.startswith("/"):
+            return "\n" * token.count("\n")
+        return token
+    return KOTLIN_COMMENT_RE.sub(replace, text)
+
+
+def analyze_kotlin(text):
+    """解析 Kotlin 源文件"""
+    text = strip_comments(text)
+    package_match = PACKAGE_RE.search(text)
+    imports = [
+        [m.group(1), bool(m.group(2)), line_of(text, m.start())]
+        for m in IMPORT_RE.finditer(text)
+    ]
+    return {
+        "empty": not text.strip(),
+        "package": package_match.group(1) if package_match else "",
+        "package_line": line_of(text, package_match.start()) if package_match else 1,
+        "imports": imports,
+        "decls": sorted(set(DECL_RE.findall(text))),
+        "binding_refs": [
+            [m.group(1), line_of(text, m.start())] for m in BINDING_ACCESS_RE.finditer(text)
+        ],
+        "r_refs": [
+            [m.group(1), m.group(2), line_of(text, m.start())] for m in R_REF_RE.finditer(text)
+        ],
+    }
+
+
+def analyze_xml(text, res_dir_type=None, file_stem=None):
+    """解析资源 XML / AndroidManifest.xml，收集资源声明和引用"""
+    decls = {}
+    refs = []
+
+    def declare(res_type, name):
+        decls.setdefault(res_type, []).append(name)
+
+    if res_dir_type and res_dir_type != "values":
+        declare(res_dir_type, file_stem)
+
+    if res_dir_type and res_dir_type.startswith("values"):
+        for m in XML_VALUES_DECL_RE.finditer(text):
+            tag, name, rest = m.group(1), m.group(2), m.group(3)
+            if tag == "item":
+                type_match = XML_ITEM_TYPE_RE.search(rest)
+                if type_match:
+                    declare(type_match.group(1), name)
+            elif tag in VALUES_TAG_TYPES:
+                declare(VALUES_TAG_TYPES[tag], name)
+
+    for m in XML_VALUE_RE.finditer(text):
+        plus, res_type, name = m.group(2), m.group(3), m.group(4)
+        if plus:
+            declare(res_type, name)
+        else:
+            refs.append([res_type, name, line_of(text, m.start())])
+
+    return {"decls": decls, "refs": refs, "ignore_binding": 'viewBindingIgnore="true"' in text}
+
+
+def analyze_gradle(text):
+    """解析模块 build.gradle.kts"""
+    return {
+        "namespace": parse_namespace(text),
+        "deps": [[config, path] for config, path in GRADLE_PROJECT_DEP_RE.findall(text)],
+    }
+
+
+class FileCache:
+    """按 (mtime, size) 缓存单文件解析结果，文件以相对项目根目录的路径作为键"""
+
+    def __init__(self, path, root=".", enabled=True):
+        self.path = path
+        self.root = root
+        self.enabled = enabled
+        self.entries = {}
+        self.dirty = False
+        if enabled and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data.get("files", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, file_path, analyzer, *args):
+        full_path = os.path.join(self.root, file_path)
+        stat = os.stat(full_path)
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry = self.entries.get(file_path)
+        if entry is not None and entry["key"] == key:
+            return entry["data"]
+        with open(full_path, "r", encoding="utf-8", errors="replace") as f:
+            data = analyzer(f.read(), *args)
+        self.entries[file_path] = {"key": key, "data": data}
+        self.dirty = True
+        return data
+
+    def save(self):
+        if not (self.enabled and self.dirty):
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+# ---------------------------------------------------------------------------
+# 项目索引
+# ---------------------------------------------------------------------------
+
+class ModuleIndex:
+    """单个模块的源码与资源索引"""
+
+    def __init__(self, name):
+        self.name = name
+        self.namespace = ""
+        self.deps = []
+        self.kotlin_files = {}
+        self.xml_files = {}
+        self.layouts = {}
+        self.resources = {}
+
+    def declares(self, res_type, res_name):
+        return res_name in self.resources.get(res_type, ())
+
+
+def build_module_index(name, tree):
+    """
+    解析模块下的 build.gradle.kts、Kotlin 源码和资源文件
+
+    tree 为 atlas_cli.model 中的文件树，索引中的路径均相对于项目根目录
+    """
+    module = ModuleIndex(name)
+    gradle_file = os.path.join(name, "build.gradle.kts")
+    if tree.exists(gradle_file):
+        gradle = tree.parse(gradle_file, analyze_gradle)
+        module.namespace = gradle["namespace"]
+        module.deps = gradle["deps"]
+
+    src_dir = os.path.join(name, "src")
+    for source_set in tree.scan(src_dir)[0]:
+        for lang_dir in ("java", "kotlin"):
+            for path in tree.walk(os.path.join(src_dir, source_set, lang_dir), (".kt",)):
+                module.kotlin_files[path] = tree.parse(path, analyze_kotlin)
+
+    manifest = os.path.join(src_dir, "main", "AndroidManifest.xml")
+    if tree.exists(manifest):
+        module.xml_files[manifest] = tree.parse(manifest, analyze_xml)
+
+    res_dir = os.path.join(src_dir, "main", "res")
+    for type_dir in tree.scan(res_dir)[0]:
+        dir_type = type_dir.split("-")[0]
+        if dir_type != "values" and dir_type not in FILE_RESOURCE_DIRS:
+            continue
+        type_path = os.path.join(res_dir, type_dir)
+        for filename in tree.scan(type_path)[1]:
+            path = os.path.join(type_path, filename)
+            stem = filename.split(".")[0]
+            if filename.endswith(".xml"):
+                data = tree.parse(path, analyze_xml, dir_type, stem)
+                module.xml_files[path] = data
+                if dir_type == "layout":
+                    module.layouts[stem] = path
+            else:
+                data = {"decls": {dir_type: [stem]}, "refs": []}
+            for res_type, names in data["decls"].items():
+                module.resources.setdefault(res_type, set()).update(names)
+    return module
+
+
+class ProjectIndex:
+    """整个项目的索引: 模块、settings include、符号表 (路径均相对于项目根目录)"""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.root = tree.root
+        self.generation = tree.generation
+        self.settings_path = "settings.gradle.kts"
+        self.includes = {}
+        if tree.exists(self.settings_path):
+            self.includes = tree.parse(self.settings_path, parse_settings_includes)
+        self.module_dirs = tree.module_dirs()
+        self.modules = {}
+        for name in self.module_dirs:
+            self.modules[name] = build_module_index(name, tree)
+
+        # 包名 -> 顶层符号集合，包名 -> 声明该包的模块集合
+        self.symbols = {}
+        self.package_modules = {}
+        self.namespaces = {}
+        for module in self.modules.values():
+            if module.namespace:
+                self.namespaces[module.namespace] = module.name
+            for path, data in module.kotlin_files.items():
+                if not data["package"] or os.sep + "main" + os.sep not in path:
+                    continue
+                self.symbols.setdefault(data["package"], set()).update(data["decls"])
+                self.package_modules.setdefault(data["package"], set()).add(module.name)
+
+    def dependency_names(self, module, transitive=False):
+        """模块依赖的项目模块名称"""
+        result = []
+        pending = [dep for _, dep in module.deps]
+        while pending:
+            name = pending.pop(0).lstrip(":").replace(":", "/")
+            if name in result or name == module.name:
+                continue
+            result.append(name)
+            if transitive and name in self.modules:
+                pending.extend(dep for _, dep in self.modules[name].deps)
+        return result
+
+    def visible_symbol_modules(self, module):
+        """Kotlin 代码可见的模块: 自身、直接依赖以及通过 api 传递的依赖"""
+        visible = {module.name}
+        pending = [dep for _, dep in module.deps]
+        while pending:
+            name = pending.pop(0).lstrip(":").replace(":", "/")
+            if name in visible or name not in self.modules:
+                continue
+            visible.add(name)
+            pending.extend(dep for config, dep in self.modules[name].deps if config == "api")
+        return visible
+
+
+_resident_indexes = {}
+
+
+def load_project_index(root=".", use_cache=True):
+    """
+    构建项目索引
+
+    普通进程中读取磁盘，解析结果按文件缓存在 .atlas/validate-cache.json；
+    atlas daemon 中基于常驻项目模型构建，模型未变化时直接复用上一次的索引
+    """
+    model = resident_model(root) if use_cache else None
+    if model is None:
+        cache = FileCache(os.path.join(root, CACHE_FILE), root, enabled=use_cache)
+        index = ProjectIndex(DiskTree(root, cache))
+        cache.save()
+        return index
+    index = _resident_indexes.get(model.root)
+    if index is None or index.generation != model.generation:
+        index = _resident_indexes[model.root] = ProjectIndex(model)
+    return index
+
+
+# ---------------------------------------------------------------------------
+# 校验
+# ---------------------------------------------------------------------------
+
+class Issue:
+    """校验问题"""
+
+    def __init__(self, path, line, category, message):
+        self.path = path
+        self.line = line
+        self.category = category
+        self.message = message
+
+    def __str__(self):
+        return f"{self.path}:{self.line}: [{self.category}] {self.message}"
+
+
+def check_settings(index, module_names):
+    """检查 settings.gradle.kts 与磁盘上的模块是否一致"""
+    issues = []
+    for name in module_names:
+        if name not in index.includes:
+            issues.append(Issue(index.settings_path, 1, "settings",
+                                f'缺少 include(":{name}")'))
+    for name, line in index.includes.items():
+        if name in module_names or (len(module_names) == len(index.module_dirs)):
+            if name not in index.modules:
+                issues.append(Issue(index.settings_path, line, "settings",
+                                    f"模块 :{name} 已 include 但目录不存在"))
+    for name in module_names:
+        module = index.modules[name]
+        for dep in index.dependency_names(module):
+            if dep not in index.includes:
+                issues.append(Issue(os.path.join(name, "build.gradle.kts"), 1, "settings",
+                                    f"依赖的模块 :{dep} 未在 settings.gradle.kts 中 include"))
+    return issues
+
+
+def check_packages(module):
+    """检查 Kotlin 包名与目录路径是否一致"""
+    issues = []
+    for path, data in module.kotlin_files.items():
+        parts = path.split(os.sep)
+        # <module>/src/<sourceSet>/<java|kotlin>/<package path>/<File>.kt
+        expected = ".".join(parts[4:-1])
+        if data["package"] != expected and not data["empty"]:
+            issues.append(Issue(path, data["package_line"], "package",
+                                f"包名 '{data['package']}' 与路径不符，应为 '{expected}'"))
+    return issues
+
+
+def is_generated_import(fqn, index):
+    """R、BuildConfig、ViewBinding 等由构建生成的类不在源码中"""
+    package, _, symbol = fqn.rpartition(".")
+    if symbol in ("R", "BuildConfig") and package in index.namespaces:
+        return True
+    return ".databinding." in fqn
+
+
+def check_imports(index, module):
+    """检查 com.sword.atlas.* 的 import 是否可解析且模块依赖完整"""
+    issues = []
+    visible = index.visible_symbol_modules(module)
+    for path, data in module.kotlin_files.items():
+        for fqn, wildcard, line in data["imports"]:
+            if not fqn.startswith(ATLAS_PACKAGE_PREFIX) or is_generated_import(fqn, index):
+                continue
+            if wildcard:
+                package, symbol = fqn, None
+            else:
+                # 支持嵌套类: 从最长的包名开始匹配
+                package, symbol = fqn.rsplit(".", 1)
+                while package not in index.symbols and "." in package:
+                    package, symbol = package.rsplit(".", 1)
+            if package not in index.symbols:
+                issues.append(Issue(path, line, "import", f"无法解析 import {fqn}: 包不存在"))
+                continue
+            if symbol is not None and symbol not in index.symbols[package]:
+                issues.append(Issue(path, line, "import",
+                                    f"无法解析 import {fqn}: {package} 中没有 {symbol}"))
+                continue
+            owners = index.package_modules[package]
+            if not owners & visible:
+                owner_list = ", ".join(f":{owner}" for owner in sorted(owners))
+                issues.append(Issue(path, line, "import",
+                                    f"import {fqn} 来自 {owner_list}，但 {module.name} 未声明该依赖"))
+    return issues
+
+
+def check_view_bindings(index, module):
+    """检查 ViewBinding 类对应的布局及访问的 ID 是否存在"""
+    issues = []
+    binding_package = f"{module.namespace}.databinding."
+    for path, data in module.kotlin_files.items():
+        layout_ids = set()
+        binding_classes = 0
+        for fqn, wildcard, line in data["imports"]:
+            if wildcard or ".databinding." not in fqn:
+                continue
+            if not fqn.startswith(binding_package):
+                issues.append(Issue(path, line, "binding",
+                                    f"{fqn} 不属于本模块命名空间 {module.namespace}"))
+                continue
+            class_name = fqn.rsplit(".", 1)[1]
+            layout = camel_to_snake(class_name[:-len("Binding")])
+            layout_path = module.layouts.get(layout)
+            if layout_path is None:
+                issues.append(Issue(path, line, "binding",
+                                    f"{class_name} 对应的布局 layout/{layout}.xml 不存在"))
+                continue
+            layout_data = module.xml_files[layout_path]
+            if layout_data.get("ignore_binding"):
+                issues.append(Issue(path, line, "binding",
+                                    f"layout/{layout}.xml 设置了 viewBindingIgnore，不会生成 {class_name}"))
+                continue
+            binding_classes += 1
+            layout_ids.update(id_to_field(i) for i in layout_data["decls"].get("id", ()))
+        if not binding_classes:
+            continue
+        for member, line in data["binding_refs"]:
+            if member not in layout_ids and member not in BINDING_BUILTIN_MEMBERS:
+                issues.append(Issue(path, line, "binding",
+                                    f"binding.{member} 在对应布局中没有 ID"))
+    return issues
+
+
+def check_resources(index, module, non_transitive):
+    """检查 XML 与 Kotlin 中的资源引用"""
+    issues = []
+    transitive = [module] + [index.modules[n] for n in index.dependency_names(module, transitive=True)
+                             if n in index.modules]
+
+    for path, data in module.xml_files.items():
+        for res_type, name, line in data["refs"]:
+            if res_type not in CHECKED_RESOURCE_TYPES:
+                continue
+            if not any(m.declares(res_type, name) for m in transitive):
+                issues.append(Issue(path, line, "resource", f"@{res_type}/{name} 无法解析"))
+
+    for path, data in module.kotlin_files.items():
+        r_module = resolve_r_module(index, module, data)
+        if r_module is None:
+            continue
+        candidates = [r_module] if non_transitive else (
+            [r_module] + [index.modules[n] for n in index.dependency_names(r_module, transitive=True)
+                          if n in index.modules])
+        for res_type, name, line in data["r_refs"]:
+            if res_type not in CHECKED_RESOURCE_TYPES:
+                continue
+            if not any(declares_r_field(m, res_type, name) for m in candidates):
+                issues.append(Issue(path, line, "resource",
+                                    f"R.{res_type}.{name} 在 :{r_module.name} 中不存在"))
+    return issues
+
+
+def declares_r_field(module, res_type, field):
+    """R 字段名中的 '.' 会被替换为 '_'"""
+    return any(name.replace(".", "_") == field for name in module.resources.get(res_type, ()))
+
+
+def resolve_r_module(index, module, data):
+    """确定 Kotlin 文件中 R 指向的模块"""
+    for fqn, wildcard, _ in data["imports"]:
+        if not wildcard and fqn.endswith(".R"):
+            owner = index.namespaces.get(fqn[:-2])
+            return index.modules.get(owner) if owner else None
+    if module.namespace and data["package"] == module.namespace:
+        return module
+    return None
+
+
+def read_gradle_property(tree, key, default):
+    """读取根目录 gradle.properties 中的配置"""
+    if tree.exists("gradle.properties"):
+        for raw in tree.read_text("gradle.properties").splitlines():
+            line = raw.strip()
+            if line and not line.startswith("#") and "=" in line:
+                k, v = line.split("=", 1)
+                if k.strip() == key:
+                    return v.strip()
+    return default
+
+
+def validate(index, module_names):
+    """对指定模块执行全部检查"""
+    issues = check_settings(index, module_names)
+    non_transitive = read_gradle_property(index.tree, "android.nonTransitiveRClass", "true") == "true"
+    for name in module_names:
+        module = index.modules[name]
+        issues.extend(check_packages(module))
+        issues.extend(check_imports(index, module))
+        issues.extend(check_view_bindings(index, module))
+        issues.extend(check_resources(index, module, non_transitive))
+    return issues
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="离线校验 Atlas 模块 (无需 Gradle 同步)")
+    parser.add_argument("modules", nargs="*", help="要校验的模块 (默认校验全部模块)")
+    parser.add_argument("--no-cache", action="store_true", help="不使用解析缓存")
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+
+    root = enter_repo_root()
+    index = load_project_index(root, use_cache=not args.no_cache)
+    module_names = [m.rstrip("/\\") for m in args.modules] or index.module_dirs
+    for name in module_names:
+        if name not in index.modules:
+            print(f"错误: 模块 {name} 不存在")
+            sys.exit(1)
+
+    issues = validate(index, module_names)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for issue in sorted(issues, key=lambda i: (i.path, i.line)):
+        print(issue)
+    print("")
+    print(f"校验了 {len(module_names)} 个模块，发现 {len(issues)} 个问题 ({elapsed:.0f}ms)")
+    if issues:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()